@@ -7,14 +7,19 @@ gerir os seus recursos (água e energia) e coordenar com agentes logísticos par
 """
 
 from spade.agent import Agent
-from spade.behaviour import PeriodicBehaviour, OneShotBehaviour, CyclicBehaviour
+from spade.behaviour import OneShotBehaviour, CyclicBehaviour
 from spade.template import Template
 import time
 import asyncio
 import json
+import heapq
 import logging
+from functools import lru_cache
 
-from agents.message import make_message
+import numpy as np
+
+from agents.message import make_message, make_messages, loads
+from config import ROWS, COLS
 
 # Constantes
 PERFORMATIVE_CFP_TASK = "cfp_task"
@@ -29,26 +34,57 @@ PERFORMATIVE_INFORM = "inform"
 
 ONTOLOGY_FARM_ACTION = "farm_action"
 
+PROPOSAL_TTL = 60 # Segundos até uma proposta sem resposta ser descartada
+RECHARGE_RETRY_DELAY = 10 # Segundos até nova tentativa após uma recarga falhada
+DONE_TIMEOUT = 60 # Segundos de tolerância pelo DONE além do ETA do LogisticAgent
+
+# Template propositadamente impossível de satisfazer. Os comportamentos alimentados
+# pelo DispatchBehaviour (filas e futures do agente) não leem a sua caixa de correio,
+# mas no SPADE um behaviour sem template recebe uma cópia de todas as mensagens.
+# Nenhuma mensagem deve definir este metadado: isso voltaria a copiar mensagens para
+# caixas de correio que nunca são lidas.
+_TEMPLATE_NO_MAILBOX = Template(metadata={"never-matched": "never-matched"})
+
 # =================================================================================
 #   Funções Auxiliares
 # =================================================================================
 
-def calculate_manhattan_distance(pos1, pos2):
+def calculate_manhattan_distance(row1, col1, row2, col2):
     """Calcula a distância de Manhattan entre duas posições.
     
     Args:
-        pos1 (tuple): Tupla (row, col) representando a primeira posição.
-        pos2 (tuple): Tupla (row, col) representando a segunda posição.
+        row1 (int): Linha da primeira posição.
+        col1 (int): Coluna da primeira posição.
+        row2 (int): Linha da segunda posição.
+        col2 (int): Coluna da segunda posição.
     
     Returns:
         int: Distância de Manhattan entre as duas posições.
     """
-    return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+    return abs(row1 - row2) + abs(col1 - col2)
 
+def energy_cost_formula(distance):
+    """Fórmula do custo de energia: 1 unidade por cada 2 unidades de distância.
+    
+    Definição única partilhada por `calculate_energy_cost` e pelo mapa de custos
+    pré-calculado do IrrigationAgent; aceita um inteiro ou um `np.ndarray` de
+    distâncias inteiras.
+    
+    Args:
+        distance (int | np.ndarray): Distância(s) total(is) a percorrer (não negativas).
+    
+    Returns:
+        int | np.ndarray: Custo(s) de energia.
+    """
+    # A distância de Manhattan nunca é negativa, pelo que o shift equivale a // 2
+    return distance >> 1
+
+@lru_cache(maxsize=256)
 def calculate_energy_cost(distance):
     """Calcula o custo de energia para percorrer uma distância.
     
-    O custo é calculado como 1 unidade de energia por cada 2 unidades de distância.
+    O custo é calculado como 1 unidade de energia por cada 2 unidades de distância
+    (ver `energy_cost_formula`).
     
     Args:
         distance (int): Distância total a percorrer.
@@ -56,222 +92,306 @@ def calculate_energy_cost(distance):
     Returns:
         int: Custo de energia necessário.
     """
-    return distance // 2
+    assert distance >= 0
+    return energy_cost_formula(distance)
+
+# O mesmo CFP é difundido a todos os agentes de irrigação, pelo que o corpo
+# descodificado é partilhado. Os dicionários devolvidos são apenas de leitura.
+_decode_body = lru_cache(maxsize=512)(loads)
 
 # =================================================================================
 #   Comportamentos
 # =================================================================================
 
 
-class CheckRechargeBehaviour(PeriodicBehaviour):
-    """Comportamento periódico que verifica a necessidade de recarga de recursos.
+class CheckRechargeBehaviour(CyclicBehaviour):
+    """Comportamento cíclico que verifica a necessidade de recarga de recursos.
     
-    Este comportamento é executado periodicamente para monitorizar os níveis de água
-    e energia do agente. Quando os recursos estão baixos (água < 15% ou energia < 15),
-    inicia o processo de recarga enviando CFPs aos agentes logísticos.
+    Em vez de verificar periodicamente, este comportamento aguarda que os níveis
+    de água ou energia do agente mudem (ver `IrrigationAgent.notify_resources_changed`).
+    Quando os recursos estão baixos (água < 15% ou energia < 15), inicia o processo
+    de recarga enviando CFPs aos agentes logísticos.
     
     Attributes:
         agent (IrrigationAgent): Referência ao agente de irrigação proprietário.
     """
 
     async def run(self):
-        """Executa a verificação periódica de recursos.
+        """Aguarda uma alteração de recursos e verifica a necessidade de recarga.
         
         Verifica os níveis de água e energia. Se algum recurso estiver baixo e o agente
         estiver idle, inicia o processo de recarga enviando CFPs aos agentes logísticos.
         """
-        # Se o agente estiver ocupado ou já a carregar, não faz nada
+        await self.agent._resource_changed.wait()
+        self.agent._resource_changed.clear()
+
+        # Se o agente estiver ocupado ou já a carregar, não faz nada: o regresso a
+        # idle (IrrigationAgent.set_idle) volta a sinalizar a verificação
         if self.agent.status != "idle":
             return
 
-        low_water = self.agent.water_capacity < 0.15 * self.agent.water_capacity_max
-        low_energy = self.agent.energy < 15 # 15% de 100 é 15
+        low_water = self.agent.water_capacity < self.agent._water_low_threshold
+        low_energy = self.agent.energy < self.agent._energy_low_threshold
 
         if low_water:
-            self.agent.logger.info(f"[IRRI] Água baixa: {self.agent.water_capacity}L. A solicitar recarga de água...")
+            self.agent.logger.info("[IRRI] Água baixa: %sL. A solicitar recarga de água...", self.agent.water_capacity)
             self.agent.status = "charging"
             
             # Envia CFP para todos os Logistics e inicia o comportamento de recolha de propostas
-            cfp_id, body = await self.agent.send_cfp_recharge_to_all(low_water=True, low_energy=False)
+            cfp_id, body, msgs = await self.agent.send_cfp_recharge_to_all(low_water=True, low_energy=False)
             
-            for to_jid in self.agent.log_jid:
-                msg = make_message(to_jid, PERFORMATIVE_CFP_RECHARGE, body)
-                await self.send(msg)
-                self.agent.logger.info(f"CFP_RECHARGE ({cfp_id}) enviado para {to_jid} a pedir {body["task_type"]} ({body["required_resources"]}).")
+            await self._broadcast(msgs)
+            self.agent.logger.info("CFP_RECHARGE (%s) enviado para %s a pedir %s (%s).", cfp_id, ', '.join(self.agent.log_jid), body["task_type"], body["required_resources"])
 
             # Adiciona o comportamento para receber as propostas
             receive_proposals_b = ReceiveRechargeProposalsBehaviour(cfp_id)
-            self.agent.add_behaviour(receive_proposals_b)
+            self.agent.add_behaviour(receive_proposals_b, template=_TEMPLATE_NO_MAILBOX)
             return # Sai para processar apenas uma recarga de cada vez
 
         if low_energy:
-            self.agent.logger.info(f"[IRRI] Energia baixa: {self.agent.energy}. A solicitar recarga de bateria...")
+            self.agent.logger.info("[IRRI] Energia baixa: %s. A solicitar recarga de bateria...", self.agent.energy)
             self.agent.status = "charging"
             
             # Envia CFP para todos os Logistics e inicia o comportamento de recolha de propostas
-            cfp_id, body  = await self.agent.send_cfp_recharge_to_all(low_water=False, low_energy=True)
+            cfp_id, body, msgs = await self.agent.send_cfp_recharge_to_all(low_water=False, low_energy=True)
             
-            for to_jid in self.agent.log_jid:
-                msg = make_message(to_jid, PERFORMATIVE_CFP_RECHARGE, body)
-                await self.send(msg)
-                self.agent.logger.info(f"CFP_RECHARGE ({cfp_id}) enviado para {to_jid} a pedir {body["task_type"]} ({body["required_resources"]}).")
+            await self._broadcast(msgs)
+            self.agent.logger.info("CFP_RECHARGE (%s) enviado para %s a pedir %s (%s).", cfp_id, ', '.join(self.agent.log_jid), body["task_type"], body["required_resources"])
 
             # Adiciona o comportamento para receber as propostas
             receive_proposals_b = ReceiveRechargeProposalsBehaviour(cfp_id)
-            self.agent.add_behaviour(receive_proposals_b)
+            self.agent.add_behaviour(receive_proposals_b, template=_TEMPLATE_NO_MAILBOX)
             return # Sai para processar apenas uma recarga de cada vez
 
+    async def _broadcast(self, msgs):
+        """Envia várias mensagens em simultâneo.
+        
+        Args:
+            msgs (list): Mensagens SPADE a enviar.
+        """
+        await asyncio.gather(*(self.send(m) for m in msgs))
+
 
-class ReceiveCFPTaskBehaviour(CyclicBehaviour):
-    """Comportamento cíclico que recebe e processa CFPs de tarefas de irrigação.
+class DispatchBehaviour(CyclicBehaviour):
+    """Comportamento cíclico que recebe as mensagens de tarefas e as encaminha.
+    
+    Substitui um comportamento cíclico por tipo de mensagem: uma única receção
+    por iteração, encaminhada pela performativa para o handler correspondente.
+    As respostas destinadas aos comportamentos adicionados dinamicamente
+    (propostas de recarga e respostas do EnvironmentAgent) são colocadas nas
+    filas do agente, evitando que cada comportamento receba cópias de todas
+    as mensagens.
     
-    Este comportamento escuta continuamente por Call For Proposals (CFPs) de agentes
-    de solo que necessitam de irrigação. Avalia cada pedido com base na disponibilidade
-    de recursos e distância, enviando propostas quando possível.
+    Attributes:
+        _handlers (dict): Mapeamento performativa -> handler assíncrono.
     """
+    async def on_start(self):
+        """Constrói a tabela de handlers por performativa."""
+        self._handlers = {
+            PERFORMATIVE_CFP_TASK: self._handle_cfp_task,
+            PERFORMATIVE_ACCEPT_PROPOSAL: self._handle_proposal_response,
+            PERFORMATIVE_REJECT_PROPOSAL: self._route_reject,
+            PERFORMATIVE_PROPOSE_RECHARGE: self._enqueue_recharge_reply,
+            PERFORMATIVE_INFORM: self._handle_env_reply,
+            PERFORMATIVE_DONE: self._handle_recharge_done,
+        }
+
     async def run(self):
-        """Recebe e processa mensagens CFP de irrigação.
+        """Recebe uma mensagem e encaminha-a para o handler da sua performativa."""
+        # O receive já bloqueia até chegar uma mensagem ou expirar o timeout
+        msg = await self.receive(timeout=5)
+        
+        if msg:
+            handler = self._handlers.get(msg.get_metadata("performative"))
+            if handler:
+                await handler(msg)
+
+    async def _route_reject(self, msg):
+        """Encaminha um REJECT para a recarga em curso ou para as propostas de tarefa.
+        
+        A mesma performativa é usada pelos SoilAgents (rejeição de uma proposta de
+        irrigação) e pelos LogisticAgents (recusa de um CFP de recarga); distinguem-se
+        pelo cfp_id.
+        
+        Args:
+            msg (Message): Mensagem de rejeição recebida.
+        """
+        try:
+            cfp_id = _decode_body(msg.body).get("cfp_id")
+        except json.JSONDecodeError:
+            cfp_id = None
+        if cfp_id is not None and cfp_id == self.agent.recharge_cfp_id:
+            self.agent._recharge_replies.put_nowait(msg)
+        else:
+            await self._handle_proposal_response(msg)
+
+    async def _enqueue_recharge_reply(self, msg):
+        """Coloca uma proposta de recarga na fila do ReceiveRechargeProposalsBehaviour.
+        
+        Args:
+            msg (Message): Proposta de recarga recebida.
+        """
+        self.agent._recharge_replies.put_nowait(msg)
+
+    async def _handle_env_reply(self, msg):
+        """Entrega uma resposta do EnvironmentAgent ao ExecuteTaskBehaviour que a aguarda.
+        
+        O EnvironmentAgent ecoa o cfp_id enviado no ACT, pelo que cada resposta chega
+        apenas à tarefa que a pediu, mesmo com várias tarefas em curso. Respostas de
+        tarefas que já expiraram são descartadas.
+        
+        Args:
+            msg (Message): Resposta (INFORM) recebida.
+        """
+        try:
+            content = _decode_body(msg.body)
+        except json.JSONDecodeError:
+            self.agent.logger.error("[IRRI] Erro ao descodificar JSON da resposta do EnvironmentAgent: %s", msg.body)
+            return
+
+        waiter = self.agent._env_waiters.get(content.get("cfp_id"))
+        if waiter is None or waiter.done():
+            self.agent.logger.warning("[IRRI] Resposta do EnvironmentAgent sem tarefa à espera (CFP %s).", content.get('cfp_id'))
+            return
+        waiter.set_result(content)
+
+    async def _handle_recharge_done(self, msg):
+        """Entrega o DONE de uma recarga ao ExecuteRechargeBehaviour que o aguarda.
+        
+        Args:
+            msg (Message): Mensagem DONE recebida de um LogisticAgent.
+        """
+        try:
+            content = _decode_body(msg.body)
+        except json.JSONDecodeError:
+            self.agent.logger.error("[IRRI] Erro ao descodificar JSON do DONE de recarga: %s", msg.body)
+            return
+
+        waiter = self.agent._recharge_waiters.get(content.get("cfp_id"))
+        if waiter is None or waiter.done():
+            self.agent.logger.warning("[IRRI] Mensagem DONE recebida com CFP_ID incorreto: %s", content.get('cfp_id'))
+            return
+        waiter.set_result(content)
+
+    async def _handle_cfp_task(self, msg):
+        """Processa um CFP de irrigação enviado por um SoilAgent.
         
         Para cada CFP recebido:
         1. Valida se é uma tarefa de irrigação
         2. Calcula distância, custo de energia e tempo estimado
         3. Verifica disponibilidade de água e energia
         4. Envia proposta se os recursos forem suficientes, ou rejeita caso contrário
-        """
-        # Template para receber CFP de qualquer SoilAgent
-        template = Template()
-        template.set_metadata("performative", PERFORMATIVE_CFP_TASK)
         
-        msg = await self.receive(timeout=5)
-        
-        if msg:
-            try:
-                content = json.loads(msg.body)
-                sender_jid = str(msg.sender)
-                cfp_id = content.get("cfp_id")
-                zone = content.get("zone")
-                required_resources = content.get("required_resources", [])
-                
-                # Apenas processa se for uma tarefa de irrigação
-                if content.get("task_type") != "irrigation_application":
-                    self.agent.logger.warning(f"[IRRI] CFP recebido não é de irrigação: {content.get('task_type')}")
-                    return
-
-                # Encontrar a quantidade de água necessária
-                water_needed = 0
-                for res in required_resources:
-                    if res.get("type") == "water":
-                        water_needed = res.get("amount")
-                        break
-                
-                if water_needed == 0:
-                    self.agent.logger.warning(f"[IRRI] CFP {cfp_id} não especifica água necessária. A rejeitar.")
-                    msg = await self.agent.send_reject_proposal(sender_jid, cfp_id)
-                    await self.send(msg)
-
-                # 1. Calcular Distância e Custo
-                target_pos = tuple(zone)
-                current_pos = self.agent.position
-                distance = calculate_manhattan_distance(current_pos, target_pos)
-                
-                # O agente tem de ir e voltar
-                total_distance = distance * 2 
-                energy_cost = calculate_energy_cost(total_distance)
-                
-                # Tempo estimado (simples: 1 tick por unidade de distância)
-                eta_ticks = total_distance 
-                
-                # 2. Verificar Capacidade e Energia
-                
-                # Se a água necessária for maior que a capacidade atual
-                if water_needed > self.agent.water_capacity:
-                    self.agent.logger.info(f"[IRRI] CFP {cfp_id} rejeitado: Água insuficiente ({water_needed}L necessários, {self.agent.water_capacity}L disponíveis).")
-                    msg = await self.agent.send_reject_proposal(sender_jid, cfp_id)
-                    await self.send(msg)
-                
-                # Se o custo de energia for maior que a energia atual
-                if energy_cost > self.agent.energy:
-                    self.agent.logger.info(f"[IRRI] CFP {cfp_id} rejeitado: Energia insuficiente ({energy_cost} necessários, {self.agent.energy} disponíveis).")
-                    msg = await self.agent.send_reject_proposal(sender_jid, cfp_id)
-                    await self.send(msg)
-                
-                # 3. Aceitar e Propor
-                self.agent.logger.info(f"[IRRI] CFP {cfp_id} aceite. A propor tarefa ao {sender_jid}. Custo de energia: {energy_cost}, ETA: {eta_ticks}.")
-                
-                # Armazenar a proposta para referência futura
-                self.agent.awaiting_proposals[cfp_id] = {
-                    "sender": sender_jid,
-                    "zone": target_pos,
-                    "water_needed": water_needed,
-                    "energy_cost": energy_cost,
-                    "eta_ticks": eta_ticks
-                }
-                
-                # Enviar Proposta
-                msg = await self.agent.send_propose_task(sender_jid, cfp_id, eta_ticks, energy_cost)
+        Args:
+            msg (Message): Mensagem CFP recebida.
+        """
+        try:
+            content = _decode_body(msg.body)
+            sender_jid = str(msg.sender)
+            cfp_id = content.get("cfp_id")
+            zone = content.get("zone")
+            required_resources = content.get("required_resources", [])
+            
+            # Apenas processa se for uma tarefa de irrigação
+            if content.get("task_type") != "irrigation_application":
+                self.agent.logger.warning("[IRRI] CFP recebido não é de irrigação: %s", content.get('task_type'))
+                return
+
+            # Encontrar a quantidade de água necessária
+            water_needed = 0
+            for res in required_resources:
+                if res.get("type") == "water":
+                    water_needed = res.get("amount")
+                    break
+            
+            if water_needed == 0:
+                self.agent.logger.warning("[IRRI] CFP %s não especifica água necessária. A rejeitar.", cfp_id)
+                msg = await self.agent.send_reject_proposal(sender_jid, cfp_id)
                 await self.send(msg)
-            except json.JSONDecodeError:
-                self.agent.logger.error(f"[IRRI] Erro ao descodificar JSON do CFP: {msg.body}")
-            except Exception as e:
-                self.agent.logger.exception(f"[IRRI] Erro ao processar CFP: {e}")
-        else:
-            # Sem mensagem, espera um pouco
-            await asyncio.sleep(0.1)
+                return
 
-class ReceiveProposalResponseBehaviour(CyclicBehaviour):
-    """Comportamento cíclico que recebe respostas a propostas de tarefas enviadas.
-    
-    Este comportamento escuta por mensagens de aceitação ou rejeição de propostas
-    enviadas aos agentes de solo. Quando uma proposta é aceite, inicia a execução
-    da tarefa de irrigação.
-    
-    """
-    async def run(self):
-        """Processa respostas (Accept/Reject) às propostas de irrigação.
+            # 1. Calcular Distância e Custo
+            trow, tcol = int(zone[0]), int(zone[1])
+            distance, energy_cost = self.agent.travel_costs(trow, tcol)
+            
+            # O agente tem de ir e voltar
+            total_distance = distance * 2 
+            
+            # Tempo estimado (simples: 1 tick por unidade de distância)
+            eta_ticks = total_distance 
+            
+            # 2. Verificar Capacidade e Energia (uma única decisão, reutilizando
+            # o custo de energia que também segue na proposta)
+            reject_reason = None
+            if water_needed > self.agent.water_capacity:
+                reject_reason = f"Água insuficiente ({water_needed}L necessários, {self.agent.water_capacity}L disponíveis)"
+            elif energy_cost > self.agent.energy:
+                reject_reason = f"Energia insuficiente ({energy_cost} necessários, {self.agent.energy} disponíveis)"
+
+            if reject_reason:
+                self.agent.logger.info("[IRRI] CFP %s rejeitado: %s.", cfp_id, reject_reason)
+                msg = await self.agent.send_reject_proposal(sender_jid, cfp_id)
+                await self.send(msg)
+                return
+            
+            # 3. Aceitar e Propor
+            self.agent.logger.info("[IRRI] CFP %s aceite. A propor tarefa ao %s. Custo de energia: %s, ETA: %s.", cfp_id, sender_jid, energy_cost, eta_ticks)
+            
+            # Armazenar a proposta para referência futura
+            self.agent.expire_proposals()
+            self.agent.track_proposal(cfp_id, {
+                "sender": sender_jid,
+                "zone": (trow, tcol),
+                "water_needed": water_needed,
+                "energy_cost": energy_cost,
+                "eta_ticks": eta_ticks
+            })
+            
+            # Enviar Proposta
+            msg = await self.agent.send_propose_task(sender_jid, cfp_id, eta_ticks, energy_cost)
+            await self.send(msg)
+        except json.JSONDecodeError:
+            self.agent.logger.error("[IRRI] Erro ao descodificar JSON do CFP: %s", msg.body)
+        except Exception as e:
+            self.agent.logger.exception("[IRRI] Erro ao processar CFP: %s", e)
+
+    async def _handle_proposal_response(self, msg):
+        """Processa uma resposta (Accept/Reject) a uma proposta de irrigação.
         
-        Para cada resposta:
         - Se ACCEPT: Inicia o comportamento de execução da tarefa
         - Se REJECT: Volta ao estado idle e descarta a proposta
-        """
-        # Template para receber Accept ou Reject de qualquer SoilAgent
-        template = Template()
-        template.set_metadata("performative", PERFORMATIVE_ACCEPT_PROPOSAL)
-        template_reject = Template()
-        template_reject.set_metadata("performative", PERFORMATIVE_REJECT_PROPOSAL)
-        
-        # Receber qualquer uma das performatives
-        msg = await self.receive(timeout=5)
         
-        if msg:
-            performative = msg.get_metadata("performative")
-            try:
-                content = json.loads(msg.body)
-                cfp_id = content.get("cfp_id")
+        Args:
+            msg (Message): Mensagem de aceitação ou rejeição recebida.
+        """
+        performative = msg.get_metadata("performative")
+        try:
+            content = _decode_body(msg.body)
+            cfp_id = content.get("cfp_id")
+            
+            if cfp_id not in self.agent.awaiting_proposals:
+                self.agent.logger.warning("[IRRI] Resposta recebida para CFP_ID desconhecido: %s", cfp_id)
+                return
+            
+            proposal_data = self.agent.awaiting_proposals.pop(cfp_id)
+            
+            if performative == PERFORMATIVE_ACCEPT_PROPOSAL:
+                self.agent.logger.info("[IRRI] Proposta %s ACEITE pelo %s. A iniciar tarefa de irrigação.", cfp_id, str(msg.sender))
                 
-                if cfp_id not in self.agent.awaiting_proposals:
-                    self.agent.logger.warning(f"[IRRI] Resposta recebida para CFP_ID desconhecido: {cfp_id}")
-                    return
+                # Iniciar o comportamento de execução da tarefa
+                task_exec_b = ExecuteTaskBehaviour(proposal_data, cfp_id)
+                self.agent.add_behaviour(task_exec_b, template=_TEMPLATE_NO_MAILBOX)
                 
-                proposal_data = self.agent.awaiting_proposals.pop(cfp_id)
+            elif performative == PERFORMATIVE_REJECT_PROPOSAL:
+                self.agent.logger.info("[IRRI] Proposta %s REJEITADA pelo %s. Motivo: %s", cfp_id, str(msg.sender), content.get('details', 'Não especificado'))
+                # O agente volta ao estado 'idle'
+                self.agent.set_idle()
                 
-                if performative == PERFORMATIVE_ACCEPT_PROPOSAL:
-                    self.agent.logger.info(f"[IRRI] Proposta {cfp_id} ACEITE pelo {str(msg.sender)}. A iniciar tarefa de irrigação.")
-                    
-                    # Iniciar o comportamento de execução da tarefa
-                    task_exec_b = ExecuteTaskBehaviour(proposal_data, cfp_id)
-                    self.agent.add_behaviour(task_exec_b)
-                    
-                elif performative == PERFORMATIVE_REJECT_PROPOSAL:
-                    self.agent.logger.info(f"[IRRI] Proposta {cfp_id} REJEITADA pelo {str(msg.sender)}. Motivo: {content.get('details', 'Não especificado')}")
-                    # O agente volta ao estado 'idle'
-                    self.agent.status = "idle"
-                    
-            except json.JSONDecodeError:
-                self.agent.logger.error(f"[IRRI] Erro ao descodificar JSON da resposta: {msg.body}")
-            except Exception as e:
-                self.agent.logger.exception(f"[IRRI] Erro ao processar resposta à proposta: {e}")
-        else:
-            await asyncio.sleep(0.1)
+        except json.JSONDecodeError:
+            self.agent.logger.error("[IRRI] Erro ao descodificar JSON da resposta: %s", msg.body)
+        except Exception as e:
+            self.agent.logger.exception("[IRRI] Erro ao processar resposta à proposta: %s", e)
+
 
 class ExecuteTaskBehaviour(OneShotBehaviour):
     """Comportamento de execução única para realizar uma tarefa de irrigação.
@@ -320,13 +440,13 @@ class ExecuteTaskBehaviour(OneShotBehaviour):
         eta_ticks = self.proposal_data["eta_ticks"]
         
         self.agent.status = "moving"
-        self.agent.logger.info(f"[IRRI] A mover para {target_pos} para irrigar. ETA: {eta_ticks} ticks.")
+        self.agent.logger.info("[IRRI] A mover para %s para irrigar. ETA: %s ticks.", target_pos, eta_ticks)
         
         # 1. Simular Viagem de Ida (metade do ETA)
         travel_time = eta_ticks // 2
         await asyncio.sleep(travel_time)
         self.agent.position = target_pos
-        self.agent.logger.info(f"[IRRI] Chegou a {target_pos}. A iniciar irrigação.")
+        self.agent.logger.info("[IRRI] Chegou a %s. A iniciar irrigação.", target_pos)
         
         # 2. Simular Irrigação e Interagir com EnvironmentAgent
         self.agent.status = "irrigating"
@@ -335,6 +455,7 @@ class ExecuteTaskBehaviour(OneShotBehaviour):
         env_jid = "environment@localhost" # Assumindo que o JID do EnvironmentAgent é este
         
         act_body = {
+            "cfp_id": cfp_id, # Ecoado na resposta do EnvironmentAgent
             "action": "apply_irrigation",
             "row": target_pos[0],
             "col": target_pos[1],
@@ -351,73 +472,71 @@ class ExecuteTaskBehaviour(OneShotBehaviour):
         act_msg.set_metadata("performative", "act")
         act_msg.set_metadata("ontology", ONTOLOGY_FARM_ACTION)
         
+        # A resposta do EnvironmentAgent (INFORM) é entregue pelo DispatchBehaviour
+        # na future desta tarefa, identificada pelo cfp_id
+        env_waiter = self.agent.expect_env_reply(cfp_id)
         await self.send(act_msg)
+
+        try:
+            reply_content = await asyncio.wait_for(env_waiter, timeout=20)
+        except asyncio.TimeoutError:
+            reply_content = None
+        finally:
+            self.agent._env_waiters.pop(cfp_id, None)
         
-        # Esperar pela resposta do EnvironmentAgent (INFORM)
-        reply_template = Template()
-        reply_template.set_metadata("performative", PERFORMATIVE_INFORM)
-        reply_template.set_metadata("ontology", ONTOLOGY_FARM_ACTION)
-        
-        env_reply = await self.receive(timeout=20)
-        
-        if env_reply:
-            try:
-                reply_content = json.loads(env_reply.body)
-                if reply_content.get("status") == "success":
-                    self.agent.logger.info(f"[IRRI] Irrigação em {target_pos} concluída com sucesso. Mensagem do ENV: {reply_content.get('message')}")
-                    
-                    # 3. Atualizar estado e simular viagem de volta
-                    self.agent.water_capacity -= water_needed
-                    self.agent.energy -= energy_cost
-                    self.agent.used_water += water_needed
-                    self.agent.logger.info(f"[IRRI] Água restante: {self.agent.water_capacity}L. Energia restante: {self.agent.energy}.")
-                    
-                    # Simular Viagem de Volta
-                    self.agent.logger.info(f"[IRRI] A regressar à base. Tempo de viagem: {travel_time} ticks.")
-                    await asyncio.sleep(travel_time)
-                    self.agent.position = (self.agent.row, self.agent.col) # Volta à posição inicial (base)
-                    self.agent.status = "idle"
-                    
-                    # 4. Enviar Done
-                    done_body = {
-                        "cfp_id": cfp_id,
-                        "status": "done",
-                        "seed_type": 0, # Não se aplica a irrigação, mas mantemos o formato
-                        "details": {"water_used": water_needed, "time_taken": eta_ticks}
-                    }
-                    done_msg = make_message(sender_jid, PERFORMATIVE_DONE, done_body)
-                    await self.send(done_msg)
-                    self.agent.logger.info(f"[IRRI] Tarefa {cfp_id} concluída e Done enviado para {sender_jid}.")
-                    
-                else:
-                    # Falha na irrigação (EnvironmentAgent reportou erro)
-                    self.agent.logger.error(f"[IRRI] Falha na irrigação em {target_pos}. Mensagem do ENV: {reply_content.get('message')}")
-                    self.agent.status = "idle"
-                    msg = await self.agent.send_failure(sender_jid, cfp_id)
-                    await self.send(msg)
-                    
-            except json.JSONDecodeError:
-                self.agent.logger.error(f"[IRRI] Erro ao descodificar JSON da resposta do EnvironmentAgent: {env_reply.body}")
-                self.agent.status = "idle"
+        if reply_content:
+            if reply_content.get("status") == "success":
+                self.agent.logger.info("[IRRI] Irrigação em %s concluída com sucesso. Mensagem do ENV: %s", target_pos, reply_content.get('message'))
+                
+                # 3. Atualizar estado e simular viagem de volta
+                self.agent.water_capacity -= water_needed
+                self.agent.energy -= energy_cost
+                self.agent.used_water += water_needed
+                self.agent.logger.info("[IRRI] Água restante: %sL. Energia restante: %s.", self.agent.water_capacity, self.agent.energy)
+                
+                # Simular Viagem de Volta
+                self.agent.logger.info("[IRRI] A regressar à base. Tempo de viagem: %s ticks.", travel_time)
+                await asyncio.sleep(travel_time)
+                self.agent.position = (self.agent.row, self.agent.col) # Volta à posição inicial (base)
+                self.agent.set_idle()
+                
+                # 4. Enviar Done
+                done_body = {
+                    "cfp_id": cfp_id,
+                    "status": "done",
+                    "seed_type": 0, # Não se aplica a irrigação, mas mantemos o formato
+                    "details": {"water_used": water_needed, "time_taken": eta_ticks}
+                }
+                done_msg = make_message(sender_jid, PERFORMATIVE_DONE, done_body)
+                await self.send(done_msg)
+                self.agent.logger.info("[IRRI] Tarefa %s concluída e Done enviado para %s.", cfp_id, sender_jid)
+                
+            else:
+                # Falha na irrigação (EnvironmentAgent reportou erro)
+                self.agent.logger.error("[IRRI] Falha na irrigação em %s. Mensagem do ENV: %s", target_pos, reply_content.get('message'))
+                self.agent.set_idle()
                 msg = await self.agent.send_failure(sender_jid, cfp_id)
                 await self.send(msg)
             
         else:
             # Timeout na resposta do EnvironmentAgent
-            self.agent.logger.error(f"[IRRI] Timeout ao esperar resposta do EnvironmentAgent para irrigação em {target_pos}.")
-            self.agent.status = "idle"
+            self.agent.logger.error("[IRRI] Timeout ao esperar resposta do EnvironmentAgent para irrigação em %s.", target_pos)
+            self.agent.set_idle()
             msg = await self.agent.send_failure(sender_jid, cfp_id)
             await self.send(msg)
 
 class ReceiveRechargeProposalsBehaviour(OneShotBehaviour):
     """Comportamento de execução única que recebe e avalia propostas de recarga.
     
-    Este comportamento aguarda por propostas de recarga de múltiplos agentes logísticos,
+    Este comportamento aguarda por propostas de recarga de múltiplos agentes logísticos
+    (encaminhadas pelo DispatchBehaviour para a fila `_recharge_replies` do agente),
     seleciona a melhor proposta e aceita-a, rejeitando as restantes.
     
     Attributes:
         cfp_id (str): Identificador único do CFP de recarga.
         proposals (list): Lista de propostas recebidas.
+        best_proposal (dict): Proposta com menor ETA recebida até ao momento.
+        responded (set): JIDs dos agentes logísticos que já responderam ao CFP.
         timeout (int): Tempo de espera por propostas (segundos).
         agent (IrrigationAgent): Referência ao agente de irrigação proprietário.
     """
@@ -430,6 +549,8 @@ class ReceiveRechargeProposalsBehaviour(OneShotBehaviour):
         super().__init__()
         self.cfp_id = cfp_id
         self.proposals = []
+        self.best_proposal = None
+        self.responded = set()
         self.timeout = 3 # Tempo para esperar por todas as propostas
 
     async def run(self):
@@ -441,79 +562,89 @@ class ReceiveRechargeProposalsBehaviour(OneShotBehaviour):
         3. Aceita a melhor proposta e rejeita as restantes
         4. Inicia o comportamento de execução da recarga
         """
-        self.agent.logger.info(f"[IRRI] A aguardar propostas de recarga para CFP {self.cfp_id}...")
-        
-        # Espera por todas as propostas até ao timeout
-        start_time = time.time()
-        while time.time() - start_time < self.timeout:
-            # Template para receber PROPOSE_RECHARGE
-            template = Template()
-            template.set_metadata("performative", PERFORMATIVE_PROPOSE_RECHARGE)
-            
-            msg = await self.receive(timeout=2) # Espera 2 segundos de cada vez
-            
-            if msg:
-                try:
-                    content = json.loads(msg.body)
-                    if content.get("cfp_id") == self.cfp_id:
-                        if content.get("eta_ticks") is None:
-                            self.agent.logger.warning(f"[IRRI] Proposta inválida recebida de {str(msg.sender)}: ETA ausente.")
-                        else:
-                            self.proposals.append({
-                                "sender": str(msg.sender),
-                                "eta_ticks": content.get("eta_ticks"),
-                                "resources": content.get("resources")
-                            })
-                            self.agent.logger.info(f"[IRRI] Proposta recebida de {str(msg.sender)}. ETA: {content.get('eta_ticks')}.")
-                except json.JSONDecodeError:
-                    self.agent.logger.error(f"[IRRI] Erro ao descodificar JSON da proposta de recarga: {msg.body}")
-            
-            await asyncio.sleep(0.1) # Pequena pausa para não bloquear
+        self.agent.logger.info("[IRRI] A aguardar propostas de recarga para CFP %s...", self.cfp_id)
+        
+        # Espera por todas as respostas até ao prazo, sem sleeps intermédios
+        deadline = time.monotonic() + self.timeout
+        while True:
+            # Espera apenas o tempo que resta até ao prazo
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                msg = await asyncio.wait_for(self.agent._recharge_replies.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break # Prazo esgotado sem novas mensagens
+
+            try:
+                content = _decode_body(msg.body)
+                if content.get("cfp_id") == self.cfp_id:
+                    sender_jid = str(msg.sender)
+                    self.responded.add(sender_jid)
+                    if msg.get_metadata("performative") == PERFORMATIVE_REJECT_PROPOSAL:
+                        self.agent.logger.info("[IRRI] %s recusou o CFP de recarga %s.", sender_jid, self.cfp_id)
+                    elif content.get("eta_ticks") is None:
+                        self.agent.logger.warning("[IRRI] Proposta inválida recebida de %s: ETA ausente.", sender_jid)
+                    else:
+                        proposal = {
+                            "sender": sender_jid,
+                            "eta_ticks": content.get("eta_ticks"),
+                            "resources": content.get("resources")
+                        }
+                        self.proposals.append(proposal)
+                        # Mantém a melhor proposta (menor ETA) à medida que chegam
+                        if self.best_proposal is None or proposal["eta_ticks"] < self.best_proposal["eta_ticks"]:
+                            self.best_proposal = proposal
+                        self.agent.logger.info("[IRRI] Proposta recebida de %s. ETA: %s.", sender_jid, content.get('eta_ticks'))
 
-        # 1. Selecionar a melhor proposta (menor ETA)
-        if not self.proposals:
-            self.agent.logger.warning(f"[IRRI] Nenhuma proposta de recarga recebida para CFP {self.cfp_id}. A tentar novamente.")
-            self.agent.status = "idle" # Volta a idle para o CheckRechargeBehaviour tentar novamente
+                    # Todos os LogisticAgents já responderam: não há mais nada a esperar
+                    if len(self.responded) >= len(self.agent.log_jid):
+                        break
+            except json.JSONDecodeError:
+                self.agent.logger.error("[IRRI] Erro ao descodificar JSON da proposta de recarga: %s", msg.body)
+
+        # 1. A melhor proposta (menor ETA) já foi escolhida durante a receção
+        best_proposal = self.best_proposal
+        if best_proposal is None:
+            self.agent.logger.warning("[IRRI] Nenhuma proposta de recarga recebida para CFP %s. A tentar novamente.", self.cfp_id)
+            self.agent.set_idle(delay=RECHARGE_RETRY_DELAY) # O CheckRechargeBehaviour tenta novamente mais tarde
             return
 
-        best_proposal = min(self.proposals, key=lambda p: p['eta_ticks'])
-        
-        self.agent.logger.info(f"[IRRI] Melhor proposta selecionada: {best_proposal['sender']} com ETA {best_proposal['eta_ticks']}.")
+        self.agent.logger.info("[IRRI] Melhor proposta selecionada: %s com ETA %s.", best_proposal['sender'], best_proposal['eta_ticks'])
 
-        # 2. Aceitar a melhor e rejeitar as outras
+        # 2. Aceitar a melhor e rejeitar as outras (as respostas seguem todas de uma vez).
+        # O DONE pode chegar assim que o ACCEPT sai, pelo que a espera é registada antes.
+        self.agent.expect_recharge_done(self.cfp_id)
+        replies = []
         for proposal in self.proposals:
-            if proposal == best_proposal:
-                # Aceitar
-                msg = await self.agent.send_accept_proposal(proposal['sender'], self.cfp_id)
-                await self.send(msg)
-                self.agent.logger.info(f"[IRRI] Proposta de {proposal['sender']} ACEITE.")
-                
-                # Iniciar o comportamento de execução da recarga
-                template = Template()
-                template.set_metadata("performative", PERFORMATIVE_DONE)
-                execute_recharge_b = ExecuteRechargeBehaviour(best_proposal,self.cfp_id)
-                self.agent.add_behaviour(execute_recharge_b,template=template)
-                
+            if proposal is best_proposal:
+                replies.append(await self.agent.send_accept_proposal(proposal['sender'], self.cfp_id))
             else:
-                # Rejeitar
-                msg = await self.agent.send_reject_proposal(proposal['sender'], self.cfp_id)
-                await self.send(msg)
-                self.agent.logger.info(f"[IRRI] Proposta de {proposal['sender']} REJEITADA.")
+                replies.append(await self.agent.send_reject_proposal(proposal['sender'], self.cfp_id))
+        await asyncio.gather(*(self.send(m) for m in replies))
+
+        for proposal in self.proposals:
+            if proposal is best_proposal:
+                self.agent.logger.info("[IRRI] Proposta de %s ACEITE.", proposal['sender'])
+            else:
+                self.agent.logger.info("[IRRI] Proposta de %s REJEITADA.", proposal['sender'])
+
+        # Iniciar o comportamento de execução da recarga
+        execute_recharge_b = ExecuteRechargeBehaviour(best_proposal,self.cfp_id)
+        self.agent.add_behaviour(execute_recharge_b, template=_TEMPLATE_NO_MAILBOX)
 
-class ExecuteRechargeBehaviour(CyclicBehaviour):
-    """Comportamento cíclico que aguarda e processa a conclusão da recarga.
+class ExecuteRechargeBehaviour(OneShotBehaviour):
+    """Comportamento de execução única que aguarda e processa a conclusão da recarga.
     
-    Este comportamento aguarda a chegada do LogisticAgent e a mensagem DONE que
-    confirma a entrega dos recursos. Após receber a confirmação, atualiza os
-    recursos do agente.
+    Este comportamento aguarda a mensagem DONE que confirma a entrega dos recursos,
+    entregue pelo DispatchBehaviour através de `IrrigationAgent.expect_recharge_done`.
+    Após receber a confirmação, atualiza os recursos do agente.
     
     Attributes:
         proposal_data (dict): Dados da proposta de recarga aceite.
         logistic_jid (str): JID do agente logístico selecionado.
         cfp_id (str): Identificador único do CFP de recarga.
         eta_ticks (int): Tempo estimado de chegada.
-        start_time (float): Timestamp do início da espera.
-        awaiting_done (bool): Flag indicando se ainda aguarda a mensagem DONE.
         agent (IrrigationAgent): Referência ao agente de irrigação proprietário.
     """
     def __init__(self, proposal_data,cfp_id):
@@ -531,83 +662,48 @@ class ExecuteRechargeBehaviour(CyclicBehaviour):
         self.logistic_jid = proposal_data["sender"]
         self.cfp_id = cfp_id
         self.eta_ticks = proposal_data["eta_ticks"]
-        self.start_time = time.time()
-        self.awaiting_done = True
-
-    async def on_start(self):
-        """Simula o tempo de espera pela chegada do agente logístico.
-        
-        Este método é executado quando o comportamento é iniciado e simula
-        o tempo de viagem do agente logístico até à posição do agente de irrigação.
-        """
-        self.agent.logger.info(f"[IRRI] A aguardar a chegada do LogisticAgent ({self.logistic_jid}). ETA: {self.eta_ticks} ticks.")
-        # Simular o tempo de espera pela chegada do LogisticAgent
-        await asyncio.sleep(self.eta_ticks)
-        self.agent.logger.info(f"[IRRI] Tempo de espera pela chegada do LogisticAgent ({self.logistic_jid}) concluído. A aguardar mensagem DONE.")
 
     async def run(self):
         """Aguarda e processa a mensagem DONE de conclusão da recarga.
         
-        Verifica continuamente por mensagens DONE do agente logístico.
-        Quando recebida, atualiza os recursos (água ou energia) e volta
-        ao estado idle. Inclui timeout para evitar espera infinita.
+        Espera pelo DONE durante no máximo o ETA do LogisticAgent mais `DONE_TIMEOUT`
+        segundos, acordando assim que ele chega. Quando recebido, atualiza os
+        recursos (água ou energia) e volta ao estado idle.
         """
-        if not self.awaiting_done:
-            self.kill()
-            return
+        self.agent.logger.info("[IRRI] A aguardar a chegada do LogisticAgent (%s). ETA: %s ticks.", self.logistic_jid, self.eta_ticks)
 
-        # Template para receber DONE do LogisticAgent
+        try:
+            content = await asyncio.wait_for(self.agent._recharge_waiters[self.cfp_id], timeout=self.eta_ticks + DONE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.agent.logger.error("[IRRI] Timeout ao esperar mensagem DONE de recarga de %s. Assumindo falha e voltando a 'idle'.", self.logistic_jid)
+            self.agent.set_idle(delay=RECHARGE_RETRY_DELAY)
+            return
+        finally:
+            self.agent._recharge_waiters.pop(self.cfp_id, None)
 
-        msg = await self.receive(timeout=5)
+        self.agent.logger.info("[IRRI] Mensagem DONE recebida de %s. Recarga concluída.", self.logistic_jid)
         
-        if msg:
-            performative = msg.get_metadata("performative")
-            sender = str(msg.sender)
-            
-            if performative == PERFORMATIVE_DONE and sender == self.logistic_jid:
-                try:
-                    content = json.loads(msg.body)
-                    if content.get("cfp_id") == self.cfp_id:
-                        self.agent.logger.info(f"[IRRI] Mensagem DONE recebida de {self.logistic_jid}. Recarga concluída.")
-                        
-                        # Repor Recursos com base nos detalhes da mensagem DONE
-                        details = content.get("details", {})
-                        energy_replenished = 0
-                        water_replenished = 0
-                        # O utilizador forneceu um exemplo com "water_used" e "time_taken".
-                        # Assumindo que "water_used" é a quantidade de água recarregada.
-                        if (details["resource_type"] == "battery"): energy_replenished = details.get("amount_delivered", 0)
-                        # Para a bateria, o LogisticAgent deve enviar a quantidade recarregada.
-                        # Vamos assumir a chave "energy_used" para consistência.
-                        else: water_replenished = details.get("amount_delivered", 0)
-                        
-                        if water_replenished > 0:
-                            self.agent.water_capacity = min(self.agent.water_capacity + water_replenished, self.agent.water_capacity_max)
-                            self.agent.logger.info(f"[IRRI] Recarga de ÁGUA concluída. Reposto: {water_replenished}L. Água atual: {self.agent.water_capacity}L.")
-                            
-                        if energy_replenished > 0:
-                            self.agent.energy = min(self.agent.energy + energy_replenished, 100)
-                            self.agent.logger.info(f"[IRRI] Recarga de ENERGIA concluída. Reposto: {energy_replenished}. Energia atual: {self.agent.energy}.")
-                            
-                            
-                        self.agent.status = "idle"
-                        self.agent.logger.info("[IRRI] Agente de Irrigação de volta ao estado 'idle'.")
-                        self.awaiting_done = False
-                        self.kill()
-                        return
-                    else:
-                        self.agent.logger.warning(f"[IRRI] Mensagem DONE recebida com CFP_ID incorreto: {content.get('cfp_id')}")
-                except json.JSONDecodeError:
-                    self.agent.logger.error(f"[IRRI] Erro ao descodificar JSON do DONE de recarga: {msg.body}")
-            else:
-                self.agent.logger.warning(f"[IRRI] Mensagem inesperada recebida durante a recarga: {performative} de {sender}")
+        # Repor Recursos com base nos detalhes da mensagem DONE
+        details = content.get("details", {})
+        energy_replenished = 0
+        water_replenished = 0
+        # O utilizador forneceu um exemplo com "water_used" e "time_taken".
+        # Assumindo que "water_used" é a quantidade de água recarregada.
+        if (details["resource_type"] == "battery"): energy_replenished = details.get("amount_delivered", 0)
+        # Para a bateria, o LogisticAgent deve enviar a quantidade recarregada.
+        # Vamos assumir a chave "energy_used" para consistência.
+        else: water_replenished = details.get("amount_delivered", 0)
         
-        # Timeout para o DONE (se for muito longo, pode ser um problema)
-        if time.time() - self.start_time > self.eta_ticks + 60: # 60 segundos extra de tolerância
-            self.agent.logger.error(f"[IRRI] Timeout ao esperar mensagem DONE de recarga de {self.logistic_jid}. Assumindo falha e voltando a 'idle'.")
-            self.agent.status = "idle"
-            self.awaiting_done = False
-            self.kill()
+        if water_replenished > 0:
+            self.agent.water_capacity = min(self.agent.water_capacity + water_replenished, self.agent.water_capacity_max)
+            self.agent.logger.info("[IRRI] Recarga de ÁGUA concluída. Reposto: %sL. Água atual: %sL.", water_replenished, self.agent.water_capacity)
+            
+        if energy_replenished > 0:
+            self.agent.energy = min(self.agent.energy + energy_replenished, 100)
+            self.agent.logger.info("[IRRI] Recarga de ENERGIA concluída. Reposto: %s. Energia atual: %s.", energy_replenished, self.agent.energy)
+            
+        self.agent.set_idle()
+        self.agent.logger.info("[IRRI] Agente de Irrigação de volta ao estado 'idle'.")
 
 
 # =================================================================================
@@ -633,7 +729,23 @@ class IrrigationAgent(Agent):
         water_capacity_max (int): Capacidade máxima de água.
         used_water (int): Total de água utilizada.
         awaiting_proposals (dict): Propostas pendentes indexadas por cfp_id.
+        _awaiting_heap (list): Heap de (prazo, cfp_id) usada para expirar propostas
+            de `awaiting_proposals` que nunca obtiveram resposta.
         recharge_cfp_id (str): ID do CFP de recarga atual.
+        _recharge_replies (asyncio.Queue): Propostas e recusas de recarga encaminhadas
+            pelo DispatchBehaviour.
+        _env_waiters (dict): Futures das tarefas que aguardam resposta do EnvironmentAgent,
+            por cfp_id, resolvidas pelo DispatchBehaviour com o conteúdo da resposta.
+        _recharge_waiters (dict): Futures das recargas aceites por cfp_id, resolvidas
+            pelo DispatchBehaviour com o conteúdo do DONE.
+        _jid_str (str): JID do agente em string, usado nos IDs de CFP.
+        _cfp_counter (int): Contador de CFPs de recarga emitidos.
+        _resource_changed (asyncio.Event): Sinaliza ao CheckRechargeBehaviour que
+            os níveis de água ou energia mudaram.
+        _water_low_threshold (float): Nível de água abaixo do qual é pedida recarga.
+        _energy_low_threshold (float): Nível de energia abaixo do qual é pedida recarga.
+        _dist_map (np.ndarray): Distância de Manhattan da base a cada célula do campo.
+        _energy_map (np.ndarray): Custo de energia (ida e volta) da base a cada célula.
     """
     def __init__(self,jid,password,log_jid,soil_jid,row,col):
         """Inicializa o agente de irrigação.
@@ -665,11 +777,30 @@ class IrrigationAgent(Agent):
         self.water_capacity_max = 100 
         self.used_water = 0
 
+        # Limiares de recarga (15% da capacidade máxima)
+        self._water_low_threshold = 0.15 * self.water_capacity_max
+        self._energy_low_threshold = 15 # 15% de 100 é 15
+
         # Estrutura para armazenar propostas enviadas e aguardando resposta (por cfp_id)
         self.awaiting_proposals = {}
+        self._awaiting_heap = []
         
         # ID para o CFP de recarga (para rastrear a recarga)
         self.recharge_cfp_id = None 
+        self._jid_str = str(jid)
+        self._cfp_counter = 0
+
+        # Fila e futures alimentadas pelo DispatchBehaviour para os comportamentos dinâmicos
+        self._recharge_replies = asyncio.Queue()
+        self._env_waiters = {}
+        self._recharge_waiters = {}
+
+        # Sinaliza alterações de recursos ao CheckRechargeBehaviour
+        self._resource_changed = asyncio.Event()
+
+        # Distâncias e custos de energia a partir da base, calculados uma única vez
+        self._dist_map = np.abs(np.arange(ROWS)[:, None] - row) + np.abs(np.arange(COLS)[None, :] - col)
+        self._energy_map = energy_cost_formula(2 * self._dist_map) # Ida e volta, como em travel_costs
 
     # =====================
     #   SETUP
@@ -677,36 +808,25 @@ class IrrigationAgent(Agent):
     async def setup(self):
         """Configura e inicia os comportamentos do agente.
         
-        Inicializa três comportamentos principais:
-        - CheckRechargeBehaviour: Verificação periódica de necessidade de recarga
-        - ReceiveCFPTaskBehaviour: Receção de CFPs de tarefas de irrigação
-        - ReceiveProposalResponseBehaviour: Receção de respostas a propostas enviadas
+        Inicializa dois comportamentos principais:
+        - CheckRechargeBehaviour: Verificação da necessidade de recarga sempre que
+          os recursos mudam
+        - DispatchBehaviour: Receção de CFPs de tarefas de irrigação e de
+          respostas a propostas enviadas
 
 
         O comportamento de recarga (ReceiveRechargeProposalsBehaviour e ExecuteRechargeBehaviour)
         é adicionado dinamicamente pelo CheckRechargeBehaviour.
         """
-        self.logger.info(f"[IRRI] IrrigationAgent {self.jid} iniciado.")
+        self.logger.info("[IRRI] IrrigationAgent %s iniciado.", self.jid)
         
         # 1. Comportamento para verificar necessidade de recarga
-        check_recharge_b = CheckRechargeBehaviour(period=10) # Verifica a cada 10 segundos
-        self.add_behaviour(check_recharge_b)
-        
-        # 2. Comportamento para receber CFP de tarefa
-        receive_cfp_b = ReceiveCFPTaskBehaviour()
-        template_cfp = Template()
-        template_cfp.set_metadata("performative", PERFORMATIVE_CFP_TASK)
-        # O agente deve ouvir todos os SoilAgents
-        self.add_behaviour(receive_cfp_b, template_cfp)
-        
-        # 3. Comportamento para receber resposta à proposta de tarefa
-        template_accept = Template()
-        template_accept.set_metadata("performative", PERFORMATIVE_ACCEPT_PROPOSAL)
-        template_reject = Template()
-        template_reject.set_metadata("performative", PERFORMATIVE_REJECT_PROPOSAL)
-        # Adicionar o mesmo comportamento para ambos os templates
-        self.add_behaviour(ReceiveProposalResponseBehaviour(), template_accept)
-        self.add_behaviour(ReceiveProposalResponseBehaviour(), template_reject)
+        check_recharge_b = CheckRechargeBehaviour() # Verifica sempre que os recursos mudam
+        self.add_behaviour(check_recharge_b, template=_TEMPLATE_NO_MAILBOX)
+        
+        # 2. Comportamento único para receber CFPs de tarefa e respostas às propostas
+        # (o encaminhamento é feito pela performativa, sem templates)
+        self.add_behaviour(DispatchBehaviour())
         
         # O comportamento de recarga (ReceiveRechargeProposalsBehaviour e ExecuteRechargeBehaviour)
         # é adicionado dinamicamente pelo CheckRechargeBehaviour.
@@ -714,10 +834,114 @@ class IrrigationAgent(Agent):
     async def stop(self):
         """Para o agente e regista a quantidade de agua usada na simulação."""
         self.logger.info(f"{'=' * 35} IRRI {'=' * 35}")
-        self.logger.info(f"{self.jid} usou {self.used_water} L de água")
+        self.logger.info("%s usou %s L de água", self.jid, self.used_water)
         self.logger.info(f"{'=' * 35} IRRI {'=' * 35}")
         await super().stop()
 
+    # =====================
+    #   Gestão de Recursos
+    # =====================
+
+    def set_idle(self, delay=0):
+        """Coloca o agente em idle e pede ao CheckRechargeBehaviour nova verificação.
+        
+        Todas as transições para idle passam por aqui: uma verificação de recarga
+        que chegue com o agente ocupado é ignorada, pelo que o regresso a idle tem
+        de voltar a sinalizar para não perder a recarga.
+        
+        Args:
+            delay (float): Segundos a aguardar antes de sinalizar (ver
+                `notify_resources_changed`).
+        """
+        self.status = "idle"
+        self.notify_resources_changed(delay=delay)
+
+    def notify_resources_changed(self, delay=0):
+        """Acorda o CheckRechargeBehaviour para reavaliar a necessidade de recarga.
+        
+        Args:
+            delay (float): Segundos a aguardar antes de sinalizar. Usado após uma
+                recarga falhada para não repetir o CFP de imediato.
+        """
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._resource_changed.set)
+        else:
+            self._resource_changed.set()
+
+    def travel_costs(self, row, col):
+        """Devolve a distância até uma célula e o custo de energia de ida e volta.
+        
+        Quando o agente está na base e a célula pertence ao campo, os valores vêm
+        dos mapas pré-calculados; caso contrário são calculados diretamente. Ambos
+        os caminhos usam `energy_cost_formula` sobre a distância de ida e volta, pelo
+        que têm de continuar consistentes se a fórmula ou o percurso mudarem.
+        
+        Args:
+            row (int): Linha da célula de destino.
+            col (int): Coluna da célula de destino.
+        
+        Returns:
+            tuple: (distância, custo de energia).
+        """
+        if self.position == (self.row, self.col) and 0 <= row < ROWS and 0 <= col < COLS:
+            return int(self._dist_map[row, col]), int(self._energy_map[row, col])
+        distance = calculate_manhattan_distance(self.position[0], self.position[1], row, col)
+        return distance, calculate_energy_cost(distance * 2)
+
+    def expect_recharge_done(self, cfp_id):
+        """Regista a espera pelo DONE de uma recarga aceite.
+        
+        Args:
+            cfp_id (str): ID do CFP de recarga.
+        
+        Returns:
+            asyncio.Future: Resolvida com o conteúdo do DONE pelo DispatchBehaviour.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._recharge_waiters[cfp_id] = waiter
+        return waiter
+
+    def expect_env_reply(self, cfp_id):
+        """Regista a espera pela resposta do EnvironmentAgent ao ACT de uma tarefa.
+        
+        Args:
+            cfp_id (str): ID do CFP da tarefa (enviado no ACT e ecoado na resposta).
+        
+        Returns:
+            asyncio.Future: Resolvida com o conteúdo da resposta pelo DispatchBehaviour.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._env_waiters[cfp_id] = waiter
+        return waiter
+
+    # =====================
+    #   Gestão de Propostas
+    # =====================
+
+    def track_proposal(self, cfp_id, proposal_data):
+        """Regista uma proposta enviada que aguarda resposta.
+        
+        Args:
+            cfp_id (str): ID do CFP a que a proposta responde.
+            proposal_data (dict): Dados da proposta (ver `ExecuteTaskBehaviour`).
+        """
+        self.awaiting_proposals[cfp_id] = proposal_data
+        heapq.heappush(self._awaiting_heap, (time.monotonic() + PROPOSAL_TTL, cfp_id))
+
+    def expire_proposals(self):
+        """Descarta as propostas que esperam resposta há mais de `PROPOSAL_TTL` segundos.
+        
+        Apenas o topo da heap é inspecionado, pelo que o custo é proporcional ao
+        número de propostas expiradas e não ao total de propostas pendentes. As
+        entradas de propostas já respondidas são ignoradas (remoção preguiçosa).
+        """
+        now = time.monotonic()
+        heap = self._awaiting_heap
+        while heap and heap[0][0] < now:
+            _, cfp_id = heapq.heappop(heap)
+            if self.awaiting_proposals.pop(cfp_id, None) is not None:
+                self.logger.info("[IRRI] Proposta %s expirou sem resposta.", cfp_id)
+
     # =====================
     #   Funções de Comunicação
     # =====================
@@ -784,12 +1008,15 @@ class IrrigationAgent(Agent):
             low_energy (bool): Se True, solicita recarga de energia.
             
         Returns:
-            tuple: (cfp_id, body) onde cfp_id é o identificador único e body 
-                   contém os dados do CFP, ou None se ambos os parâmetros forem False.
+            tuple: (cfp_id, body, msgs) onde cfp_id é o identificador único, body 
+                   contém os dados do CFP e msgs as mensagens prontas a enviar a cada
+                   agente logístico, ou None se ambos os parâmetros forem False.
         """
         
-        # Gera um ID único para o CFP de recarga
-        cfp_id = f"recharge_{self.jid}_{time.time()}"
+        # Gera um ID único para o CFP de recarga (contador monotónico por agente)
+        self._cfp_counter += 1
+        cfp_id = f"recharge_{self._jid_str}_{self._cfp_counter}"
+        self.recharge_cfp_id = cfp_id
         
         # Determina o tipo de recurso necessário e a quantidade (inteiro)
         if low_water:
@@ -809,9 +1036,9 @@ class IrrigationAgent(Agent):
             "position": self.position,
             "priority": "High",
         }
-    
+        msgs = make_messages(self.log_jid, PERFORMATIVE_CFP_RECHARGE, body)
             
-        return cfp_id,body
+        return cfp_id, body, msgs
 
     async def send_accept_proposal(self, to_jid, cfp_id):
         """Envia aceitação de proposta de recarga.
@@ -12,12 +12,17 @@ import json
 import logging
 import random
 import time
-from math import ceil
+from bisect import bisect
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate, count
+from math import ceil, inf
 
 from spade.agent import Agent
 from spade.behaviour import CyclicBehaviour, OneShotBehaviour
+from spade.message import Message
 from spade.template import Template
-from agents.message import make_message
+from agents.message import dumps, make_message, make_messages, loads
 
 
 # Constantes
@@ -25,6 +30,8 @@ PERFORMATIVE_INFORM_LOGS = "inform_logs"
 PERFORMATIVE_CFP_RECHARGE = "cfp_recharge"
 PERFORMATIVE_PROPOSE_RECHARGE = "propose_recharge"
 PERFORMATIVE_INFORM_CROP = "inform_crop"
+PERFORMATIVE_CFP_TASK = "cfp_task"
+PERFORMATIVE_PROPOSE_TASK = "propose_task"
 PERFORMATIVE_ACCEPT_PROPOSAL = "accept-proposal"
 PERFORMATIVE_REJECT_PROPOSAL = "reject-proposal"
 PERFORMATIVE_DONE = "Done"
@@ -32,10 +39,60 @@ PERFORMATIVE_FAILURE = "failure"
 ONTOLOGY_FARM_ACTION = "farm_action"
 
 MAX_CAPACITY = 1000
+PROPOSAL_TTL = 60 # Segundos até uma proposta de reabastecimento sem resposta ser descartada
+# Recursos não-sementes guardados em LogisticsAgent.resources
+RECHARGEABLE = ("water", "fertilizer", "battery", "pesticide", "fuel")
+# Stock inicial de cada agente (copiado em __init__, nunca alterado)
+_INITIAL_RESOURCES = dict.fromkeys(RECHARGEABLE, MAX_CAPACITY)
+_INITIAL_SEEDS = dict.fromkeys(range(6), MAX_CAPACITY) # 0: Tomate, 1: Pimento, 2: Trigo, 3: Couve, 4: Alface, 5: Cenoura
+
+# Máximo de mensagens tratadas por iteração do DispatchBehaviour
+DISPATCH_BATCH = 32
+
+# Números de sequência dos cfp_id gerados pelos Logistics Agents (ver LogisticsAgent.new_cfp_id)
+_CFP_COUNTER = count()
+
+# Respostas ACCEPT/REJECT/PROPOSE_RECHARGE têm sempre a mesma forma: só os valores variam
+_PROPOSE_RECHARGE_BODY = '{"cfp_id":%s,"eta_ticks":%s,"resources":%s,"priority":"High"}'
+_PROPOSE_RECHARGE_METADATA = {"performative": PERFORMATIVE_PROPOSE_RECHARGE, "language": "json"}
+_ACCEPT_BODY = '{"cfp_id":%s,"decision":"accept"}'
+_REJECT_BODY = '{"cfp_id":%s,"decision":"reject"}'
+_ACCEPT_METADATA = {"performative": PERFORMATIVE_ACCEPT_PROPOSAL, "language": "json"}
+_REJECT_METADATA = {"performative": PERFORMATIVE_REJECT_PROPOSAL, "language": "json"}
+
+# Templates partilhados pelos behaviours criados em cada CFP de tarefa
+_TEMPLATE_PROPOSE_TASK = Template(metadata={"performative": PERFORMATIVE_PROPOSE_TASK})
+# DONE ou FAILURE: um único TaskDoneReceiver trata ambos os desfechos
+_TEMPLATE_TASK_RESULT = (
+    Template(metadata={"performative": PERFORMATIVE_DONE})
+    | Template(metadata={"performative": PERFORMATIVE_FAILURE})
+)
 # =====================
 #   FUNÇÕES AUXILIARES
 # =====================
 
+# Uma mensagem pode ser entregue a vários receivers (e.g., os TaskDoneReceiver de
+# tarefas em curso), pelo que o corpo descodificado é partilhado entre eles.
+# Os dicionários devolvidos são apenas de leitura.
+_decode_body = lru_cache(maxsize=512)(loads)
+
+
+@dataclass(slots=True)
+class CropTask:
+    """Registo de uma zona em tratamento (valor de `pending_crop_tasks`).
+    
+    As zonas anunciadas por outros Logistics Agents ficam com os valores
+    por omissão, pois apenas interessa saber que estão ocupadas.
+    
+    Attributes:
+        crop_type (int): Tipo de cultura (-1 se desconhecido).
+        state (int): Estado da zona (-1 se desconhecido).
+        harvester_jid (str | None): JID do Harvester Agent escolhido.
+    """
+    crop_type: int = -1
+    state: int = -1
+    harvester_jid: str | None = None
+
 def calculate_distance(pos1, pos2):
     """Calcula a distância de Manhattan entre duas posições.
     
@@ -82,7 +139,7 @@ def get_seasaon(day):
     else:
         return "Winter"    
 
-def get_probs(season):
+def _compute_probs(season):
     """Calcula probabilidades de plantio por tipo de planta com base na estação.
     
     As probabilidades são ajustadas conforme a estação:
@@ -141,21 +198,38 @@ def get_probs(season):
 
     return probs
 
-def get_seed(probs):
-    """Seleciona um tipo de planta aleatoriamente com base nas probabilidades.
+def _cumulative_weights(season):
+    """Calcula os pesos acumulados das plantas para uma estação.
+    
+    As probabilidades só dependem da estação, pelo que estes pesos são
+    calculados uma única vez para `_CUM_BY_SEASON` e reutilizados por `get_seed`.
     
     Args:
-        probs (dict): Dicionário {tipo_planta: probabilidade}.
+        season (str): Estação do ano ("Spring", "Summer", "Autumn" ou "Winter").
     
     Returns:
-        int: Índice do tipo de planta selecionado (0-5).
+        tuple: Par (pesos_acumulados, índices) com os pesos acumulados e os
+            índices das plantas correspondentes, pela mesma ordem.
     """
-    indices = list(probs.keys())
-    pesos = [probs[i] for i in indices]
+    probs = _compute_probs(season)
+    return tuple(accumulate(probs.values())), tuple(probs.keys())
 
-    chosen = random.choices(indices, weights=pesos, k=1)[0]
+_CUM_BY_SEASON = {season: _cumulative_weights(season) for season in ("Spring", "Summer", "Autumn", "Winter")}
 
-    return chosen
+def get_seed(season):
+    """Seleciona um tipo de planta aleatoriamente com base nas probabilidades da estação.
+    
+    Usa os pesos acumulados pré-calculados em `_CUM_BY_SEASON` e uma pesquisa
+    binária, em vez de reconstruir as listas de pesos a cada chamada.
+    
+    Args:
+        season (str): Estação do ano ("Spring", "Summer", "Autumn", "Winter").
+    
+    Returns:
+        int: Índice do tipo de planta selecionado (0-5).
+    """
+    cum, indices = _CUM_BY_SEASON[season]
+    return indices[bisect(cum, random.random() * cum[-1], 0, len(cum) - 1)]
 
 # =====================
 #   BEHAVIOURS
@@ -171,27 +245,34 @@ class AutoRechargeBehaviour(CyclicBehaviour):
     async def run(self):
         """Executa um ciclo de recarga automática.
         
-        Aguarda 5 segundos e, se o agente estiver ocioso, recarrega
-        todos os recursos em 10 unidades até o máximo de 1000.
+        Se o agente estiver ocupado, aguarda que volte a idle (ver
+        `LogisticsAgent.set_idle`) em vez de acordar periodicamente. Depois
+        aguarda 5 segundos e, se o agente estiver ocioso, recarrega todos os
+        recursos em 10 unidades até o máximo de 1000.
         """
+        # Ocupado: dorme até à próxima transição para idle
+        if self.agent.status != "idle":
+            self.agent.idle_event.clear()
+            await self.agent.idle_event.wait()
+
         # Espera um período para o próximo ciclo de recarga
         await asyncio.sleep(5) # Recarrega a cada 5 segundos (ajustado conforme o pedido)
 
         if self.agent.status == "idle":
             
-            # Recursos que não são sementes
-            resources_to_recharge = ["water", "fertilizer", "battery", "pesticide", "fuel"]
             recharge_amount = 10 # Valor fixo de recarga (conforme o pedido)
+            log_debug = self.agent.logger.isEnabledFor(logging.DEBUG)
             
             # 1. Recarregar recursos não-sementes
-            for resource in resources_to_recharge:
-                storage_attr = f"{resource}_storage"
-                current_storage = getattr(self.agent, storage_attr)
+            resources = self.agent.resources
+            for resource in RECHARGEABLE:
+                current_storage = resources[resource]
                 
                 if current_storage < MAX_CAPACITY:
                     new_storage = min(MAX_CAPACITY, current_storage + recharge_amount)
-                    setattr(self.agent, storage_attr, new_storage)
-                    self.agent.logger.info(f"[AUTO_RECHARGE] Recarregado {resource}. Novo stock: {new_storage}/{MAX_CAPACITY}")
+                    resources[resource] = new_storage
+                    if log_debug:
+                        self.agent.logger.debug("[AUTO_RECHARGE] Recarregado %s. Novo stock: %s/%s", resource, new_storage, MAX_CAPACITY)
             
             # 2. Recarregar sementes (que é um dicionário)
             seed_storage = self.agent.seed_storage
@@ -200,138 +281,187 @@ class AutoRechargeBehaviour(CyclicBehaviour):
                 if current_amount < MAX_CAPACITY:
                     new_amount = min(MAX_CAPACITY, current_amount + recharge_amount)
                     seed_storage[seed_type] = new_amount
-                    self.agent.logger.info(f"[AUTO_RECHARGE] Recarregado semente {seed_type}. Novo stock: {new_amount}/{MAX_CAPACITY}")
+                    if log_debug:
+                        self.agent.logger.debug("[AUTO_RECHARGE] Recarregado semente %s. Novo stock: %s/%s", seed_type, new_amount, MAX_CAPACITY)
                 
         else:
-            self.agent.logger.debug(f"[AUTO_RECHARGE] Agente ocupado ({self.agent.status}). Recarga adiada.")
+            self.agent.logger.debug("[AUTO_RECHARGE] Agente ocupado (%s). Recarga adiada.", self.agent.status)
                 
 
-class CFPRechargeReceiver(CyclicBehaviour):
-    """Recebe e processa mensagens CFP para reabastecimento.
+class DispatchBehaviour(CyclicBehaviour):
+    """Recebe as mensagens de reabastecimento e de coordenação e encaminha-as.
     
-    Avalia CFPs recebidos de outros agentes, verifica disponibilidade
-    de recursos e envia propostas com ETA e quantidade disponível.
+    Substitui um comportamento cíclico por tipo de mensagem (CFPs de
+    reabastecimento, respostas às propostas e INFORM_LOGS): uma única receção
+    por iteração, encaminhada pela performativa para o handler correspondente.
+    
+    Attributes:
+        _handlers (dict): Mapeamento performativa -> handler assíncrono.
     """
+    async def on_start(self):
+        """Constrói a tabela de handlers por performativa."""
+        self._handlers = {
+            PERFORMATIVE_CFP_RECHARGE: self._handle_cfp_recharge,
+            PERFORMATIVE_ACCEPT_PROPOSAL: self._handle_recharge_response,
+            PERFORMATIVE_REJECT_PROPOSAL: self._handle_recharge_response,
+            PERFORMATIVE_INFORM_LOGS: self._handle_inform_logs,
+        }
 
     async def run(self):
+        """Recebe mensagens e encaminha-as para o handler da sua performativa.
+        
+        Espera pela primeira mensagem e trata de seguida as que já estiverem
+        na caixa de correio (até `DISPATCH_BATCH`), pela ordem de chegada.
+        """
+        msg = await self.receive(timeout=5)
+
+        handled = 0
+        while msg:
+            handler = self._handlers.get(msg.get_metadata("performative"))
+            if handler:
+                await handler(msg)
+            handled += 1
+            if handled >= DISPATCH_BATCH:
+                break
+            # Sem timeout o receive não bloqueia: devolve None se a caixa estiver vazia
+            msg = await self.receive()
+
+    async def _handle_cfp_recharge(self, msg):
         """Processa um CFP de reabastecimento.
         
         Verifica:
         1. Se o agente está disponível
         2. Se tem recursos suficientes
         3. Calcula ETA e envia proposta
+        
+        Args:
+            msg (Message): Mensagem CFP_RECHARGE recebida.
         """
-        msg = await self.receive(timeout=5)
-
-        if msg:
-            try:
-                content = json.loads(msg.body)
-                cfp_id = content.get("cfp_id")
-                task_type = content.get("task_type")
-                required_resources = content.get("required_resources")
-                position = tuple(content.get("position"))
-                seed_type = content.get("seed_type")
-                sender_jid = str(msg.sender)
-
-                self.agent.logger.info(f"[CFP_RECHARGE] Recebido CFP {cfp_id} para {task_type} de {sender_jid} em {position}.")
-                # 1. Verificar se o agente está ocupado
-                if self.agent.status != "idle" or self.agent.status == "await":
-                    self.agent.logger.info(f"[CFP_RECHARGE] Agente ocupado ({self.agent.status}). Rejeitando proposta.")
-                    msg = await self.agent.send_reject_proposal(sender_jid, cfp_id)
-                    await self.send(msg)
-                    return
-
-                # 2. Verificar se tem recursos suficientes
-                has_resources = False
-                resource_amount = 0
-                if task_type == "seeds":
-                    if seed_type is not None and self.agent.seed_storage.get(seed_type, 0) > 0:
-                        # O agente pode reabastecer uma percentagem do que tem
-                        available_seed = self.agent.seed_storage.get(seed_type, 0)
-                    
-                        if available_seed >= required_resources:
-                            resource_amount = required_resources
-                            has_resources = True
-                
-                elif task_type in ["water", "fertilizer", "battery", "pesticide", "fuel"]:
-                    storage_attr = f"{task_type}_storage"
-                    current_storage = getattr(self.agent, storage_attr, 0)
-                    if current_storage >= required_resources:
-                            resource_amount = required_resources
-                            has_resources = True
-                
-                if not has_resources:
-                    self.agent.logger.warning(f"[CFP_RECHARGE] Recursos insuficientes para {task_type} (Recursos disponíveis: {getattr(self.agent, f'{task_type}_storage', 0)}). Rejeitando.")
-                    msg = await self.agent.send_reject_proposal(sender_jid, cfp_id)
-                    await self.send(msg)
-                    return
-
-                # 3. Calcular ETA
-                distance = calculate_distance(self.agent.position, position)
-                eta_ticks = calculate_eta(distance)
-                # 4. Enviar Proposta
-                self.agent.pending_recharge_proposals[cfp_id] = {
-                    "position": position,
-                    "task_type": task_type,
-                    "seed_type": seed_type,
-                    "resource_amount": resource_amount,
-                    "eta_ticks": eta_ticks,
-                    "cfp_id": cfp_id
-                }
-                self.agent.status = "await"
-                msg = await self.agent.send_propose_recharge(sender_jid, cfp_id, eta_ticks, resource_amount)
+        try:
+            content = _decode_body(msg.body)
+            cfp_id = content.get("cfp_id")
+            sender_jid = str(msg.sender)
+
+            # 1. Verificar se o agente está ocupado (antes de extrair o resto do CFP)
+            if self.agent.status != "idle":
+                self.agent.logger.info("[CFP_RECHARGE] Agente ocupado (%s). Rejeitando CFP %s de %s.", self.agent.status, cfp_id, sender_jid)
+                msg = self.agent.send_reject_proposal(sender_jid, cfp_id)
                 await self.send(msg)
-                self.agent.logger.info(f"[CFP_RECHARGE] Proposta enviada para {sender_jid}. ETA: {eta_ticks}s, Recursos: {resource_amount}.")
-        
-            except json.JSONDecodeError:
-                self.agent.logger.error(f"[CFP_RECHARGE] Erro ao descodificar JSON: {msg.body}")
-            except Exception as e:
-                self.agent.logger.exception(f"[CFP_RECHARGE] Erro ao processar CFP: {e}")
+                return
 
+            task_type = content.get("task_type")
+            required_resources = content.get("required_resources")
+            position = tuple(content.get("position"))
+            seed_type = content.get("seed_type")
+            self.agent.logger.info("[CFP_RECHARGE] Recebido CFP %s para %s de %s em %s.", cfp_id, task_type, sender_jid, position)
+
+            # 2. Verificar se tem recursos suficientes
+            has_resources = False
+            resource_amount = 0
+            if task_type == "seeds":
+                # O agente pode reabastecer uma percentagem do que tem
+                available_seed = self.agent.seed_storage.get(seed_type, 0)
+                if available_seed > 0 and available_seed >= required_resources:
+                    resource_amount = required_resources
+                    has_resources = True
+
+            else:
+                # As chaves de `resources` são os tipos válidos: um único acesso valida e lê o stock
+                current_storage = self.agent.resources.get(task_type)
+                if current_storage is not None and current_storage >= required_resources:
+                    resource_amount = required_resources
+                    has_resources = True
+            
+            if not has_resources:
+                self.agent.logger.warning("[CFP_RECHARGE] Recursos insuficientes para %s (Recursos disponíveis: %s). Rejeitando.", task_type, self.agent.resources.get(task_type, 0))
+                msg = self.agent.send_reject_proposal(sender_jid, cfp_id)
+                await self.send(msg)
+                return
 
-class AcceptRejectRechargeReceiver(CyclicBehaviour):
-    """Recebe aceitações ou rejeições de propostas de reabastecimento.
+            # 3. Calcular ETA
+            distance = calculate_distance(self.agent.position, position)
+            eta_ticks = calculate_eta(distance)
+            # 4. Enviar Proposta
+            self.agent.track_proposal(cfp_id, {
+                "position": position,
+                "task_type": task_type,
+                "seed_type": seed_type,
+                "resource_amount": resource_amount,
+                "eta_ticks": eta_ticks,
+                "cfp_id": cfp_id
+            })
+            self.agent.status = "await"
+            msg = self.agent.send_propose_recharge(sender_jid, cfp_id, eta_ticks, resource_amount)
+            await self.send(msg)
+            self.agent.logger.info("[CFP_RECHARGE] Proposta enviada para %s. ETA: %ss, Recursos: %s.", sender_jid, eta_ticks, resource_amount)
     
-    Processa mensagens ACCEPT_PROPOSAL e REJECT_PROPOSAL,
-    iniciando a tarefa de reabastecimento quando aceite.
-    """
+        except json.JSONDecodeError:
+            self.agent.logger.error("[CFP_RECHARGE] Erro ao descodificar JSON: %s", msg.body)
+        except Exception as e:
+            self.agent.logger.exception("[CFP_RECHARGE] Erro ao processar CFP: %s", e)
 
-    async def run(self):
+    async def _handle_recharge_response(self, msg):
         """Processa uma resposta a uma proposta de reabastecimento.
         
         Se aceite, inicia o RechargeTaskBehaviour.
         Se rejeitada, volta ao estado idle.
+        
+        Args:
+            msg (Message): Mensagem ACCEPT_PROPOSAL ou REJECT_PROPOSAL recebida.
         """
-        msg = await self.receive(timeout=5)
+        try:
+            content = _decode_body(msg.body)
+            cfp_id = content.get("cfp_id")
+            sender_jid = str(msg.sender)
 
-        if msg:
-            try:
-                content = json.loads(msg.body)
-                cfp_id = content.get("cfp_id")
-                sender_jid = str(msg.sender)
+            performative = msg.metadata["performative"]
 
-                if cfp_id in self.agent.pending_recharge_proposals:
-                    if msg.metadata["performative"] == PERFORMATIVE_REJECT_PROPOSAL:
-                        self.agent.logger.info(f"[REJECT_RECHARGE] Proposta {cfp_id} rejeitada por {sender_jid}.")
-                        self.agent.status = "idle"
-                        # Remover a proposta pendente
-                        if cfp_id in self.agent.pending_recharge_proposals:
-                            del self.agent.pending_recharge_proposals[cfp_id]
-                        return
-                    proposal = self.agent.pending_recharge_proposals.pop(cfp_id)
-                    self.agent.logger.info(f"[ACCEPT_RECHARGE] Proposta {cfp_id} aceite por {sender_jid}. A iniciar reabastecimento.")
-                    
-                    # Iniciar o comportamento de reabastecimento
-                    recharge_task = RechargeTaskBehaviour(sender_jid, proposal)
-                    self.agent.add_behaviour(recharge_task)
-                    self.agent.status = "handling_task"
-                else:
-                    self.agent.logger.warning(f"[ACCEPT_RECHARGE] Recebido ACCEPT para CFP {cfp_id} desconhecido.")
+            # A proposta pendente é removida em ambos os casos (aceite ou rejeitada)
+            proposal = self.agent.pop_proposal(cfp_id)
+            if proposal is None:
+                self.agent.logger.warning("[RECHARGE_RESPONSE] Recebido %s para CFP %s desconhecido.", performative, cfp_id)
+                return
 
-            except json.JSONDecodeError:
-                self.agent.logger.error(f"[ACCEPT_RECHARGE] Erro ao descodificar JSON: {msg.body}")
-            except Exception as e:
-                self.agent.logger.exception(f"[ACCEPT_RECHARGE] Erro ao processar ACCEPT: {e}")
+            if performative == PERFORMATIVE_REJECT_PROPOSAL:
+                self.agent.logger.info("[REJECT_RECHARGE] Proposta %s rejeitada por %s.", cfp_id, sender_jid)
+                self.agent.set_idle()
+                return
+
+            self.agent.logger.info("[ACCEPT_RECHARGE] Proposta %s aceite por %s. A iniciar reabastecimento.", cfp_id, sender_jid)
+
+            # Iniciar o comportamento de reabastecimento
+            recharge_task = RechargeTaskBehaviour(sender_jid, proposal)
+            self.agent.add_behaviour(recharge_task)
+            self.agent.status = "handling_task"
+
+        except json.JSONDecodeError:
+            self.agent.logger.error("[ACCEPT_RECHARGE] Erro ao descodificar JSON: %s", msg.body)
+        except Exception as e:
+            self.agent.logger.exception("[ACCEPT_RECHARGE] Erro ao processar ACCEPT: %s", e)
+
+    async def _handle_inform_logs(self, msg):
+        """Processa mensagens INFORM_LOGS de outros Logistic Agents.
+        
+        Adiciona ou remove zonas da lista de tarefas pendentes
+        conforme a informação recebida, evitando processamento duplicado.
+        
+        Args:
+            msg (Message): Mensagem INFORM_LOGS recebida.
+        """
+        try:
+            content = _decode_body(msg.body)
+            zone = tuple(content.get("zone"))
+            add_or_remove = content.get("add_or_remove")
+            if add_or_remove:
+                self.agent.pending_crop_tasks[zone] = CropTask()
+                self.agent.logger.info("[INFORM_LOG] Zona %s adicionada à lista", zone)
+            else:
+                del self.agent.pending_crop_tasks[zone] 
+                self.agent.logger.info("[INFORM_LOG] Zona %s removida da lista", zone)
+        except json.JSONDecodeError:
+            self.agent.logger.error("[INFORM_LOG] Erro ao descodificar JSON: %s", msg.body)
+        except Exception as e:
+            self.agent.logger.exception("[INFORM_LOG] Erro ao processar INFORM_CROP: %s", e)
 
 
 class RechargeTaskBehaviour(OneShotBehaviour):
@@ -348,6 +478,7 @@ class RechargeTaskBehaviour(OneShotBehaviour):
         resource_amount (int): Quantidade a entregar.
         seed_type (int): Tipo de semente (se aplicável).
         cfp_id (str): ID do CFP.
+        _abort (asyncio.Event): Interrompe a viagem quando definido (ver `abort`).
     """
 
     def __init__(self, receiver_jid, proposal):
@@ -372,6 +503,15 @@ class RechargeTaskBehaviour(OneShotBehaviour):
         self.resource_amount = proposal["resource_amount"]
         self.seed_type = proposal["seed_type"]
         self.cfp_id = proposal["cfp_id"]
+        self._abort = asyncio.Event()
+
+    def abort(self):
+        """Interrompe a tarefa durante a viagem.
+        
+        A entrega não é feita, o inventário não é alterado e o agente volta
+        de imediato ao estado idle.
+        """
+        self._abort.set()
 
     async def run(self):
         """Executa a tarefa de reabastecimento.
@@ -383,21 +523,26 @@ class RechargeTaskBehaviour(OneShotBehaviour):
         4. Envio de mensagem DONE
         5. Retorno à base
         """
-        self.agent.logger.info(f"[RECHARGE_TASK] A mover-se para {self.target_pos} para reabastecer {self.receiver_jid}.")
+        self.agent.logger.info("[RECHARGE_TASK] A mover-se para %s para reabastecer %s.", self.target_pos, self.receiver_jid)
         
         # 1. Simular a viagem (ida e volta)
-        # O ETA já é o tempo total de ida e volta
-        await asyncio.sleep(self.eta_ticks)
+        # O ETA já é o tempo total de ida e volta; `abort` encurta a espera
+        try:
+            await asyncio.wait_for(self._abort.wait(), timeout=self.eta_ticks)
+        except asyncio.TimeoutError:
+            pass
+        else:
+            self.agent.logger.warning("[RECHARGE_TASK] Tarefa %s interrompida antes da entrega a %s.", self.cfp_id, self.receiver_jid)
+            self.agent.set_idle()
+            return
 
-        self.agent.logger.info(f"[RECHARGE_TASK] Chegou a {self.target_pos}. A entregar {self.resource_amount} a {self.receiver_jid}")
+        self.agent.logger.info("[RECHARGE_TASK] Chegou a %s. A entregar %s a %s", self.target_pos, self.resource_amount, self.receiver_jid)
 
         # 2. Atualizar o armazenamento do Logistic Agent
         if self.task_type == "seeds":
             self.agent.seed_storage[self.seed_type] -= self.resource_amount
         else:
-            storage_attr = f"{self.task_type}_storage"
-            current_storage = getattr(self.agent, storage_attr)
-            setattr(self.agent, storage_attr, current_storage - self.resource_amount)
+            self.agent.resources[self.task_type] -= self.resource_amount
 
         # 3. Enviar mensagem DONE para o agente reabastecido
         details = {
@@ -405,16 +550,16 @@ class RechargeTaskBehaviour(OneShotBehaviour):
             "amount_delivered": self.resource_amount,
             "seed_type": self.seed_type if self.task_type == "seeds" else None
         }
-        msg = await self.agent.send_done(self.receiver_jid, self.cfp_id, details)
+        msg = self.agent.send_done(self.receiver_jid, self.cfp_id, details)
         await self.send(msg)
-        self.agent.logger.info(f"[RECHARGE_TASK] DONE enviado para {self.receiver_jid}.")
+        self.agent.logger.info("[RECHARGE_TASK] DONE enviado para %s.", self.receiver_jid)
 
         # 4. Retornar à base (já incluído no ETA, mas para clareza no log)
-        self.agent.logger.info(f"[RECHARGE_TASK] A regressar à base {self.agent.position}.")
+        self.agent.logger.info("[RECHARGE_TASK] A regressar à base %s.", self.agent.position)
         # O tempo de retorno já foi consumido no sleep inicial
         
         # 5. Voltar ao estado idle
-        self.agent.status = "idle"
+        self.agent.set_idle()
         self.agent.logger.info("[STATUS] Agente voltou ao estado 'idle'.")
 
 class InformOtherLogs(OneShotBehaviour):
@@ -446,53 +591,22 @@ class InformOtherLogs(OneShotBehaviour):
         Informa todos os outros agentes logísticos sobre o estado
         de processamento da zona.
         """
-        for jid in self.agent.log_jid:
-            if str(jid) != str(self.agent.jid):
-                msg = make_message(
-                    to = str(jid),
-                    performative = PERFORMATIVE_INFORM_LOGS,
-                    body_dict={
-                        "cfp_id": f"cfp_inform_log_{time.time()}",
-                        "zone": self.zone,
-                        "add_or_remove": self.add_or_remove
-                    }
-                )
-                await self.send(msg)
-                self.agent.logger.info(f"[INFORM_LOG] Zona {self.zone} enviada para {jid}.")
+        peers = self.agent._peer_log_jids
+        # O corpo é o mesmo para todos os destinatários, pelo que é codificado uma única vez
+        msgs = make_messages(
+            peers,
+            PERFORMATIVE_INFORM_LOGS,
+            {
+                "cfp_id": self.agent.new_cfp_id("inform_log"),
+                "zone": self.zone,
+                "add_or_remove": self.add_or_remove
+            }
+        )
+        await asyncio.gather(*(self.send(msg) for msg in msgs))
+        for jid in peers:
+            self.agent.logger.info("[INFORM_LOG] Zona %s enviada para %s.", self.zone, jid)
         return
         
-class ReceiveInformOtherLogs(CyclicBehaviour):
-    """Recebe informações sobre zonas em processamento de outros Logistic Agents.
-    
-    Atualiza a lista local de tarefas pendentes para evitar
-    processamento duplicado de zonas.
-    """
-
-    async def run(self):
-        """Processa mensagens INFORM_LOGS.
-        
-        Adiciona ou remove zonas da lista de tarefas pendentes
-        conforme a informação recebida.
-        """
-        msg = await self.receive(timeout=5)
-
-        if msg:
-            try:
-                content = json.loads(msg.body)
-                zone = tuple(content.get("zone"))
-                add_or_remove = content.get("add_or_remove")
-                if add_or_remove:
-                    self.agent.pending_crop_tasks[zone] = {}
-                    self.agent.logger.info(f"[INFORM_LOG] Zona {zone} adicionada à lista")
-                else:
-                    del self.agent.pending_crop_tasks[zone] 
-                    self.agent.logger.info(f"[INFORM_LOG] Zona {zone} removida da lista")
-            except json.JSONDecodeError:
-                self.agent.logger.error(f"[INFORM_LOG] Erro ao descodificar JSON: {msg.body}")
-            except Exception as e:
-                self.agent.logger.exception(f"[INFORM_LOG] Erro ao processar INFORM_CROP: {e}")
-
-
 class InformCropReceiver(CyclicBehaviour):
     """Recebe pedidos de plantio/colheita do Drone Agent.
     
@@ -509,26 +623,28 @@ class InformCropReceiver(CyclicBehaviour):
         - Evita processar zonas já em tratamento
         """
 
-        if self.agent.status == "await": 
-            return
+        # Enquanto aguarda propostas, os pedidos ficam na caixa de correio: espera
+        # pela mudança de estado em vez de repetir o ciclo sem ceder o processador
+        if self.agent.status == "await":
+            await self.agent.ready_event.wait()
 
         msg = await self.receive(timeout=5)
         if msg:
             try:
-                content = json.loads(msg.body)
+                content = _decode_body(msg.body)
                 zone = tuple(content.get("zone"))
                 crop_type = content.get("crop_type")
                 state = content.get("state")
                 sender_jid = str(msg.sender)
-                self.agent.logger.info(f"[INFORM_CROP] Recebido inform de {sender_jid} para zona {zone}. Estado: {state}.")
+                self.agent.logger.info("[INFORM_CROP] Recebido inform de %s para zona %s. Estado: %s.", sender_jid, zone, state)
 
                 # 1. Verificar se a zona já está a ser tratada
                 if zone in self.agent.pending_crop_tasks:
-                    self.agent.logger.info(f"[INFORM_CROP] Zona {zone} já tem tarefa pendente. Ignorando pedido repetido.")
+                    self.agent.logger.info("[INFORM_CROP] Zona %s já tem tarefa pendente. Ignorando pedido repetido.", zone)
                     return
 
                 # 2. Adicionar a zona à lista de tarefas pendentes
-                self.agent.pending_crop_tasks[zone] = {"crop_type": crop_type, "state": state, "harvester_jid": None}
+                self.agent.pending_crop_tasks[zone] = CropTask(crop_type, state)
                 
                 inform_log = InformOtherLogs(zone,1)
                 self.agent.add_behaviour(inform_log)
@@ -540,10 +656,8 @@ class InformCropReceiver(CyclicBehaviour):
 
                     day = self.agent.field.day
                     season = get_seasaon(day)
-                    probs = get_probs(season)
-                    seed_type = get_seed(probs)
-                    #print(f"Estação: {season}, Probabilidades: {probs}, Semente escolhida: {seed_type}")
-                    self.agent.logger.info(f"[INFORM_CROP] Ação: Plantar semente {seed_type} em {zone}.")
+                    seed_type = get_seed(season)
+                    self.agent.logger.info("[INFORM_CROP] Ação: Plantar semente %s em %s.", seed_type, zone)
                     
                     # Iniciar CFP para Harvester Agents
                     cfp_task = CFPTaskInitiator(zone, task_type, seed_type)
@@ -551,23 +665,23 @@ class InformCropReceiver(CyclicBehaviour):
 
                 elif state == 4: # Ready for harvesting -> Colher
                     task_type = "harvest_application"
-                    self.agent.logger.info(f"[INFORM_CROP] Ação: Colher em {zone}.")
+                    self.agent.logger.info("[INFORM_CROP] Ação: Colher em %s.", zone)
                     
                     # Iniciar CFP para Harvester Agents
                     cfp_task = CFPTaskInitiator(zone, task_type, crop_type)
                     self.agent.add_behaviour(cfp_task)
                 
                 else:
-                    self.agent.logger.warning(f"[INFORM_CROP] Estado desconhecido ({state}). Ignorando.")
+                    self.agent.logger.warning("[INFORM_CROP] Estado desconhecido (%s). Ignorando.", state)
                     del self.agent.pending_crop_tasks[zone] # Remover se for um estado inválido
 
                     inform_log = InformOtherLogs(zone,0)
                     self.agent.add_behaviour(inform_log)
 
             except json.JSONDecodeError:
-                self.agent.logger.error(f"[INFORM_CROP] Erro ao descodificar JSON: {msg.body}")
+                self.agent.logger.error("[INFORM_CROP] Erro ao descodificar JSON: %s", msg.body)
             except Exception as e:
-                self.agent.logger.exception(f"[INFORM_CROP] Erro ao processar INFORM_CROP: {e}")
+                self.agent.logger.exception("[INFORM_CROP] Erro ao processar INFORM_CROP: %s", e)
 
 
 class CFPTaskInitiator(OneShotBehaviour):
@@ -580,7 +694,7 @@ class CFPTaskInitiator(OneShotBehaviour):
         zone (tuple): Coordenadas da zona.
         task_type (str): Tipo de tarefa ("plant_application" ou "harvest_application").
         seed_or_crop_type (int): Tipo de semente ou cultura.
-        cfp_id (str): ID único do CFP.
+        cfp_id (str): ID único do CFP (atribuído no início de `run`).
     """
 
     def __init__(self, zone, task_type, seed_or_crop_type):
@@ -595,7 +709,7 @@ class CFPTaskInitiator(OneShotBehaviour):
         self.zone = zone
         self.task_type = task_type
         self.seed_or_crop_type = seed_or_crop_type
-        self.cfp_id = f"cfp_task_{time.time()}"
+        self.cfp_id = None
 
     async def run(self):
         """Envia CFPs para todos os Harvester Agents.
@@ -603,7 +717,8 @@ class CFPTaskInitiator(OneShotBehaviour):
         Define recursos necessários e inicia comportamento
         de recepção de propostas (CFPTaskReceiver).
         """
-        self.agent.logger.info(f"[CFP_INIT] A iniciar CFP {self.cfp_id} para {self.task_type} em {self.zone}.")
+        self.cfp_id = self.agent.new_cfp_id("task")
+        self.agent.logger.info("[CFP_INIT] A iniciar CFP %s para %s em %s.", self.cfp_id, self.task_type, self.zone)
         
         # Recursos necessários (simplificado para o CFP inicial)
         required_resources = []
@@ -612,28 +727,29 @@ class CFPTaskInitiator(OneShotBehaviour):
         elif self.task_type == "harvest_application":
             required_resources.append({"type": "storage", "amount": 1}) # Exemplo: 1 unidade de armazenamento
 
-        # Enviar CFP para todos os Harvester Agents
-        for harv_jid in self.agent.harv_jid :
-            msg = make_message(
-                to=harv_jid,
-                performative="cfp_task",
-                body_dict={
-                    "cfp_id": self.cfp_id,
-                    "task_type": self.task_type,
-                    "seed_type": self.seed_or_crop_type,
-                    "zone": list(self.zone),
-                    "required_resources": required_resources,
-                    "priority": "Medium"
-                }
-            )
-            await self.send(msg)
-            self.agent.logger.info(f"[CFP_INIT] CFP enviado para {harv_jid}.")
+        # Enviar CFP para todos os Harvester Agents (envios em simultâneo)
+        # O corpo é o mesmo para todos os destinatários, pelo que é codificado uma única vez
+        msgs = make_messages(
+            self.agent.harv_jid,
+            PERFORMATIVE_CFP_TASK,
+            {
+                "cfp_id": self.cfp_id,
+                "task_type": self.task_type,
+                "seed_type": self.seed_or_crop_type,
+                "zone": list(self.zone),
+                "required_resources": required_resources,
+                "priority": "Medium"
+            }
+        )
+        await asyncio.gather(*(self.send(msg) for msg in msgs))
+        for harv_jid in self.agent.harv_jid:
+            self.agent.logger.info("[CFP_INIT] CFP enviado para %s.", harv_jid)
 
         # Esperar pelas propostas
-        self.agent.add_behaviour(CFPTaskReceiver(self.cfp_id, self.zone, self.task_type, self.seed_or_crop_type), template=Template(metadata={"performative": "propose_task"}))
+        self.agent.add_behaviour(CFPTaskReceiver(self.cfp_id, self.zone, self.task_type, self.seed_or_crop_type), template=_TEMPLATE_PROPOSE_TASK)
 
 
-class CFPTaskReceiver(CyclicBehaviour):
+class CFPTaskReceiver(OneShotBehaviour):
     """Recebe e avalia propostas dos Harvester Agents.
     
     Recebe propostas durante um período de timeout, seleciona
@@ -645,7 +761,9 @@ class CFPTaskReceiver(CyclicBehaviour):
         task_type (str): Tipo de tarefa.
         seed_or_crop_type (int): Tipo de semente ou cultura.
         proposals (dict): Propostas recebidas {jid: {eta, cost}}.
-        timeout (float): Timestamp do timeout.
+        best_jid (str | None): Harvester com o menor ETA recebido até ao momento.
+        best_eta (float): ETA da melhor proposta (infinito enquanto não houver propostas).
+        timeout (float): Instante limite (time.monotonic) para receber propostas.
     """
 
     def __init__(self, cfp_id, zone, task_type, seed_or_crop_type):
@@ -663,89 +781,91 @@ class CFPTaskReceiver(CyclicBehaviour):
         self.task_type = task_type
         self.seed_or_crop_type = seed_or_crop_type
         self.proposals = {}
-        self.timeout = time.time() + 2 # Tempo limite para receber propostas
+        self.best_jid = None
+        self.best_eta = inf
+        self.timeout = time.monotonic() + 2 # Tempo limite para receber propostas
 
     async def run(self):
         """Recebe propostas e seleciona a melhor após timeout.
         
         Processo:
-        1. Recebe propostas durante o período de timeout
-        2. Ao atingir timeout, avalia propostas
+        1. Recebe propostas até ao timeout ou até todos os Harvesters responderem
+        2. Avalia as propostas recebidas
         3. Seleciona Harvester com menor ETA
         4. Envia ACCEPT ao vencedor e REJECT aos demais
         5. Inicia TaskDoneReceiver para aguardar conclusão
         """
-        # 1. Receber propostas
+        # 1. Receber propostas até ao prazo, ou até todos os Harvesters responderem
         self.agent.status = "await"
-        msg = await self.receive(timeout=1)
-        if msg:
+        expected = len(self.agent.harv_jid)
+        while len(self.proposals) < expected:
+            remaining = self.timeout - time.monotonic()
+            if remaining <= 0:
+                break
+            msg = await self.receive(timeout=remaining)
+            if not msg:
+                break # Prazo esgotado sem novas propostas
             try:
-                content = json.loads(msg.body)
+                content = _decode_body(msg.body)
                 cfp_id = content.get("cfp_id")
                 eta_ticks = content.get("eta_ticks")
                 fuel_cost = content.get("fuel_cost") 
                 sender_jid = str(msg.sender)
             
                 if cfp_id == self.cfp_id:
-                    self.agent.logger.info(f"[CFP_TASK_RECV] Proposta recebida de {sender_jid}. ETA: {eta_ticks}, Custo: {fuel_cost}.")
+                    if eta_ticks is None:
+                        self.agent.logger.warning("[CFP_TASK_RECV] Proposta inválida recebida de %s: ETA ausente.", sender_jid)
+                        continue
+                    self.agent.logger.info("[CFP_TASK_RECV] Proposta recebida de %s. ETA: %s, Custo: %s.", sender_jid, eta_ticks, fuel_cost)
                     self.proposals[sender_jid] = {"eta": eta_ticks, "cost": fuel_cost}
+                    # Critério de seleção: menor ETA (em empate fica a primeira proposta)
+                    if eta_ticks < self.best_eta:
+                        self.best_jid = sender_jid
+                        self.best_eta = eta_ticks
             
             except json.JSONDecodeError:
-                self.agent.logger.error(f"[CFP_TASK_RECV] Erro ao descodificar JSON: {msg.body}")
+                self.agent.logger.error("[CFP_TASK_RECV] Erro ao descodificar JSON: %s", msg.body)
             except Exception as e:
-                self.agent.logger.exception(f"[CFP_TASK_RECV] Erro ao processar PROPOSE_TASK: {e}")
-
-        # 2. Avaliar propostas após o timeout ou se todas as propostas foram recebidas (simplificado, apenas por timeout)
-        if time.time() > self.timeout:
-            self.agent.logger.info(f"[CFP_TASK_RECV] Tempo limite atingido para CFP {self.cfp_id}. A avaliar propostas.")
-            
-            if not self.proposals:
-                self.agent.logger.warning(f"[CFP_TASK_RECV] Nenhuma proposta recebida para CFP {self.cfp_id}. Tarefa falhada.")
-                # Remover a tarefa pendente
-                if self.zone in self.agent.pending_crop_tasks:
-                    self.agent.status = "idle"
-                    del self.agent.pending_crop_tasks[self.zone]
-
-                    inform_log = InformOtherLogs(self.zone,0)
-                    self.agent.add_behaviour(inform_log)
+                self.agent.logger.exception("[CFP_TASK_RECV] Erro ao processar PROPOSE_TASK: %s", e)
 
-                self.kill()
-                return
+        # 2. Avaliar propostas (prazo atingido ou todas as propostas recebidas)
+        self.agent.logger.info("[CFP_TASK_RECV] Recolha de propostas terminada para CFP %s. A avaliar propostas.", self.cfp_id)
+        
+        if not self.proposals or self.best_jid is None:
+            self.agent.logger.warning("[CFP_TASK_RECV] Nenhuma proposta recebida para CFP %s. Tarefa falhada.", self.cfp_id)
+            self.agent.set_idle()
+            # Remover a tarefa pendente
+            if self.zone in self.agent.pending_crop_tasks:
+                del self.agent.pending_crop_tasks[self.zone]
+
+                inform_log = InformOtherLogs(self.zone,0)
+                self.agent.add_behaviour(inform_log)
+            return
 
-            # Critério de seleção: Menor ETA
-            best_harvester = min(self.proposals.items(), key=lambda item: item[1]["eta"])
-            best_jid = best_harvester[0]
-            
-            self.agent.logger.info(f"[CFP_TASK_RECV] Harvester selecionado: {best_jid} com ETA {best_harvester[1]['eta']}.")
-
-            # 3. Enviar ACCEPT para o melhor e REJECT para os outros
-            for jid in self.proposals:
-                if jid == best_jid:
-                    msg = await self.agent.send_accept_proposal(jid, self.cfp_id)
-                    await self.send(msg)
-                    # Atualizar a tarefa pendente com o Harvester selecionado
-                    if self.zone in self.agent.pending_crop_tasks:
-                        self.agent.pending_crop_tasks[self.zone]["harvester_jid"] = jid
-                else:
-                    msg = await self.agent.send_reject_proposal(jid, self.cfp_id)
-                    await self.send(msg)
-            
-            # 4. Adicionar o comportamento para receber o DONE
-            self.agent.status = "idle"
-            template_accept = Template()
-            template_accept.set_metadata("performative", PERFORMATIVE_DONE)
+        # A melhor proposta foi sendo atualizada à medida que as propostas chegaram
+        best_jid = self.best_jid
 
-            template_failure = Template()
-            template_failure.set_metadata("performative", PERFORMATIVE_FAILURE)
+        self.agent.logger.info("[CFP_TASK_RECV] Harvester selecionado: %s com ETA %s.", best_jid, self.best_eta)
 
-            self.agent.add_behaviour(TaskDoneReceiver(self.cfp_id, self.zone), template=template_accept)
-            self.agent.add_behaviour(TaskDoneReceiver(self.cfp_id, self.zone), template=template_failure)
-            
-            self.kill()
+        # 3. Enviar ACCEPT para o melhor e REJECT para os outros (envios em simultâneo)
+        msgs = []
+        for jid in self.proposals:
+            if jid == best_jid:
+                msgs.append(self.agent.send_accept_proposal(jid, self.cfp_id))
+                # Atualizar a tarefa pendente com o Harvester selecionado
+                if self.zone in self.agent.pending_crop_tasks:
+                    self.agent.pending_crop_tasks[self.zone].harvester_jid = jid
+            else:
+                msgs.append(self.agent.send_reject_proposal(jid, self.cfp_id))
+        await asyncio.gather(*(self.send(msg) for msg in msgs))
+        
+        # 4. Adicionar o comportamento para receber o DONE
+        self.agent.set_idle()
+        self.agent.add_behaviour(TaskDoneReceiver(self.cfp_id, self.zone), template=_TEMPLATE_TASK_RESULT)
 
 
 class TaskDoneReceiver(CyclicBehaviour):
-    """Recebe mensagens DONE do Harvester Agent após conclusão de tarefas.
+    """Recebe a mensagem DONE ou FAILURE do Harvester Agent no fim de uma tarefa.
     
     Attributes:
         cfp_id: ID da Call for Proposals.
@@ -766,7 +886,7 @@ class TaskDoneReceiver(CyclicBehaviour):
     async def run(self):
         """Executa o ciclo de recepção de mensagens DONE.
         
-        Aguarda mensagens com performative DONE, processa o status da tarefa
+        Aguarda mensagens com performative DONE ou FAILURE, processa o status da tarefa
         (done ou failure), remove a tarefa da lista de pendentes e notifica
         outros agentes através do InformOtherLogs behaviour.
         
@@ -777,13 +897,11 @@ class TaskDoneReceiver(CyclicBehaviour):
             json.JSONDecodeError: Se o corpo da mensagem não for JSON válido.
             Exception: Outros erros durante o processamento da mensagem.
         """
-        template = Template()
-        template.set_metadata("performative", PERFORMATIVE_DONE)
         msg = await self.receive(timeout=5)
 
         if msg:
             try:
-                content = json.loads(msg.body)
+                content = _decode_body(msg.body)
                 cfp_id = content.get("cfp_id")
                 sender_jid = str(msg.sender)
                 status = content.get("status")
@@ -791,18 +909,18 @@ class TaskDoneReceiver(CyclicBehaviour):
                 if cfp_id == self.cfp_id:
 
                     if status == "done":
-                        self.agent.logger.info(f"[TASK_DONE] Recebido DONE de {sender_jid} para CFP {cfp_id} na zona {self.zone}.")
+                        self.agent.logger.info("[TASK_DONE] Recebido DONE de %s para CFP %s na zona %s.", sender_jid, cfp_id, self.zone)
                         
                         # Remover a tarefa da lista de pendentes
                         if self.zone in self.agent.pending_crop_tasks:
                             del self.agent.pending_crop_tasks[self.zone]
-                            self.agent.logger.info(f"[TASK_DONE] Tarefa da zona {self.zone} removida da lista de pendentes.")
+                            self.agent.logger.info("[TASK_DONE] Tarefa da zona %s removida da lista de pendentes.", self.zone)
                     
                     else:
-                        self.agent.logger.info(f"[TASK_FAILURE] Recebido FAILURE de {sender_jid} para CFP {cfp_id} na zona {self.zone}.")
+                        self.agent.logger.info("[TASK_FAILURE] Recebido FAILURE de %s para CFP %s na zona %s.", sender_jid, cfp_id, self.zone)
                         if self.zone in self.agent.pending_crop_tasks:
                             del self.agent.pending_crop_tasks[self.zone]
-                            self.agent.logger.info(f"[TASK_FAILURE] Tarefa da zona {self.zone} removida da lista de pendentes.")
+                            self.agent.logger.info("[TASK_FAILURE] Tarefa da zona %s removida da lista de pendentes.", self.zone)
                     
                     
                     inform_log = InformOtherLogs(self.zone,0)
@@ -810,15 +928,33 @@ class TaskDoneReceiver(CyclicBehaviour):
                     self.kill()
 
             except json.JSONDecodeError:
-                self.agent.logger.error(f"[TASK_FAILURE] Erro ao descodificar JSON: {msg.body}")
+                self.agent.logger.error("[TASK_FAILURE] Erro ao descodificar JSON: %s", msg.body)
             except Exception as e:
-                self.agent.logger.exception(f"[TASK_FAILURE] Erro ao processar DONE: {e}")
+                self.agent.logger.exception("[TASK_FAILURE] Erro ao processar DONE: %s", e)
 
 
 # =====================
 #   AGENT
 # =====================
 
+def _resource_property(resource):
+    """Cria uma propriedade `<recurso>_storage` ligada a `LogisticsAgent.resources`.
+    
+    Args:
+        resource (str): Nome do recurso em `RECHARGEABLE`.
+    
+    Returns:
+        property: Propriedade de leitura e escrita sobre o dicionário de recursos.
+    """
+    def getter(self):
+        return self.resources[resource]
+
+    def setter(self, value):
+        self.resources[resource] = value
+
+    return property(getter, setter)
+
+
 class LogisticsAgent(Agent):
     """Agente de logística responsável por gestão de recursos e reabastecimento.
     
@@ -828,10 +964,11 @@ class LogisticsAgent(Agent):
     
     Attributes:
         field (Field): Representação do campo agrícola.
-        harv_jid (str): JID do Harvester Agent.
+        harv_jid (tuple): JIDs dos Harvester Agents.
         log_jid (str): JID de outros Logistics Agents.
         position (tuple): Posição atual (row, col) do agente.
         status (str): Estado atual do agente (idle, moving, handling_task, await).
+        resources (dict): Quantidade armazenada de cada recurso em `RECHARGEABLE`.
         water_storage (int): Quantidade de água armazenada.
         fertilizer_storage (int): Quantidade de fertilizante armazenada.
         battery_storage (int): Quantidade de bateria armazenada.
@@ -839,15 +976,28 @@ class LogisticsAgent(Agent):
         fuel_storage (int): Quantidade de combustível armazenada.
         seed_storage (dict): Dicionário mapeando tipo de semente para quantidade.
         pending_recharge_proposals (dict): Propostas de reabastecimento pendentes.
-        pending_crop_tasks (dict): Tarefas de cultivo pendentes por zona.
+        pending_crop_tasks (dict): Tarefas de cultivo pendentes (`CropTask`) por zona.
+        idle_event (asyncio.Event): Sinaliza a transição do agente para idle.
+        ready_event (asyncio.Event): Definido sempre que o agente não está em "await".
+        _proposal_timers (dict): Temporizadores de expiração das propostas pendentes.
+        _jid_str (str): JID do agente em string.
+        _cfp_prefix (str): Parte local do JID, usada nos cfp_id gerados pelo agente.
+        _peer_log_jids (tuple): JIDs (em string) dos outros Logistics Agents.
     """
+    # Compatibilidade com o acesso por atributo aos recursos
+    water_storage = _resource_property("water")
+    fertilizer_storage = _resource_property("fertilizer")
+    battery_storage = _resource_property("battery")
+    pesticide_storage = _resource_property("pesticide")
+    fuel_storage = _resource_property("fuel")
+
     def __init__(self, jid, password, harv_jid, log_jid, row, col, field):
         """Inicializa o LogisticsAgent.
         
         Args:
             jid (str): Jabber ID do agente.
             password (str): Password para autenticação.
-            harv_jid (str): JID do Harvester Agent.
+            harv_jid (list): JIDs dos Harvester Agents.
             log_jid (str): JID de outros Logistics Agents.
             row (int): Coordenada de linha da posição inicial.
             col (int): Coordenada de coluna da posição inicial.
@@ -861,30 +1011,30 @@ class LogisticsAgent(Agent):
         
         self.field = field  # Representação do campo 
 
-        self.harv_jid = harv_jid
+        # Cópia imutável: a lista recebida é partilhada por todos os Logistics Agents
+        self.harv_jid = tuple(harv_jid)
         self.log_jid = log_jid
+        # JIDs em string calculados uma única vez
+        self._jid_str = str(jid)
+        self._cfp_prefix = self._jid_str.split("@", 1)[0]
+        # A topologia é estática: os destinatários dos INFORM_LOGS ficam fixos
+        self._peer_log_jids = tuple(j for j in map(str, log_jid) if j != self._jid_str)
         self.position = (row, col)
+
+        # Acorda o AutoRechargeBehaviour quando o agente volta a idle
+        self.idle_event = asyncio.Event()
+        # Acorda o InformCropReceiver quando o agente sai de "await"
+        self.ready_event = asyncio.Event()
         self.status = "idle"  # idle, moving, handling_task, await
 
-        # Armazenamento de Recursos
-        self.water_storage = 1000  # initial water storage
-        self.fertilizer_storage = 1000  # initial fertilizer storage
-        self.battery_storage = 1000  # initial battery storage
-        self.pesticide_storage = 1000  # initial pesticide storage
-        self.fuel_storage = 1000  # initial fuel storage
-
-        self.seed_storage =  {
-            0: 1000, # 0: Tomate 
-            1: 1000, # 1: Pimento
-            2: 1000, # 2: Trigo
-            3: 1000, # 3: Couve
-            4: 1000, # 4: Alface
-            5: 1000  # 5: Cenoura
-        }
+        # Armazenamento de Recursos (os atributos *_storage são vistas sobre este dicionário)
+        self.resources = dict(_INITIAL_RESOURCES)
+        self.seed_storage = dict(_INITIAL_SEEDS)
         
         # Estado de gestão de tarefas
         self.pending_recharge_proposals = {} # {cfp_id: proposal_details}
-        self.pending_crop_tasks = {} # {zone: {"crop_type": ..., "state": ..., "harvester_jid": ...}}
+        self.pending_crop_tasks = {} # {zone: CropTask}
+        self._proposal_timers = {} # {cfp_id: asyncio.TimerHandle}
 
 
     async def setup(self):
@@ -892,10 +1042,9 @@ class LogisticsAgent(Agent):
         
         Adiciona os behaviours necessários para:
         - Reabastecimento automático (AutoRechargeBehaviour)
-        - Recepção de CFPs de reabastecimento (CFPRechargeReceiver)
-        - Aceitação/rejeição de propostas (AcceptRejectRechargeReceiver)
+        - Recepção de CFPs de reabastecimento, aceitação/rejeição de propostas
+          e informações de outros logs (DispatchBehaviour)
         - Recepção de informações de cultivo (InformCropReceiver)
-        - Recepção de informações de outros logs (ReceiveInformOtherLogs)
         
         Returns:
             None
@@ -906,27 +1055,99 @@ class LogisticsAgent(Agent):
 
         self.add_behaviour(AutoRechargeBehaviour())
 
-        template = Template()
-        template.set_metadata("performative", PERFORMATIVE_CFP_RECHARGE)
-        self.add_behaviour(CFPRechargeReceiver(),template=template)
-
-        template_accept = Template()
-        template_accept.set_metadata("performative", PERFORMATIVE_ACCEPT_PROPOSAL)
-
-        template_reject = Template()
-        template_reject.set_metadata("performative", PERFORMATIVE_REJECT_PROPOSAL)    
-
-        self.add_behaviour(AcceptRejectRechargeReceiver(),template=template_accept)
-        self.add_behaviour(AcceptRejectRechargeReceiver(),template=template_reject)
+        # Um único comportamento para CFPs de reabastecimento, respostas às propostas e INFORM_LOGS
+        template = (
+            Template(metadata={"performative": PERFORMATIVE_CFP_RECHARGE})
+            | Template(metadata={"performative": PERFORMATIVE_ACCEPT_PROPOSAL})
+            | Template(metadata={"performative": PERFORMATIVE_REJECT_PROPOSAL})
+            | Template(metadata={"performative": PERFORMATIVE_INFORM_LOGS})
+        )
+        self.add_behaviour(DispatchBehaviour(), template=template)
 
+        # O InformCropReceiver continua separado: enquanto o agente está em "await"
+        # deixa os pedidos na sua caixa de correio até poder tratá-los
         template = Template()
         template.set_metadata("performative", PERFORMATIVE_INFORM_CROP)
         self.add_behaviour(InformCropReceiver(), template=template)
 
+    # =====================
+    #   GESTÃO DE ESTADO
+    # =====================
+    @property
+    def status(self):
+        """str: Estado atual do agente (idle, moving, handling_task, await)."""
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = value
+        if value == "await":
+            self.ready_event.clear()
+        else:
+            self.ready_event.set()
 
-        template = Template()
-        template.set_metadata("performative",PERFORMATIVE_INFORM_LOGS)
-        self.add_behaviour(ReceiveInformOtherLogs(), template=template)
+    def set_idle(self):
+        """Coloca o agente em idle e acorda o AutoRechargeBehaviour."""
+        self.status = "idle"
+        self.idle_event.set()
+
+    def track_proposal(self, cfp_id, proposal_details):
+        """Regista uma proposta de reabastecimento enviada que aguarda resposta.
+        
+        Se não chegar ACCEPT nem REJECT em `PROPOSAL_TTL` segundos, a proposta
+        é descartada (ver `_expire_proposal`).
+        
+        Args:
+            cfp_id (str): ID do CFP a que a proposta responde.
+            proposal_details (dict): Dados da proposta (ver `RechargeTaskBehaviour`).
+        """
+        self.pending_recharge_proposals[cfp_id] = proposal_details
+        self._proposal_timers[cfp_id] = asyncio.get_running_loop().call_later(
+            PROPOSAL_TTL, self._expire_proposal, cfp_id
+        )
+
+    def pop_proposal(self, cfp_id):
+        """Remove uma proposta pendente e cancela a sua expiração.
+        
+        Args:
+            cfp_id (str): ID do CFP a que a proposta responde.
+        
+        Returns:
+            dict | None: Dados da proposta, ou None se não estiver pendente.
+        """
+        timer = self._proposal_timers.pop(cfp_id, None)
+        if timer is not None:
+            timer.cancel()
+        return self.pending_recharge_proposals.pop(cfp_id, None)
+
+    def _expire_proposal(self, cfp_id):
+        """Descarta uma proposta sem resposta e liberta o agente.
+        
+        Sem isto, uma resposta perdida deixaria o agente em "await"
+        indefinidamente, a rejeitar CFPs e com os pedidos de cultivo parados.
+        
+        Args:
+            cfp_id (str): ID do CFP a que a proposta responde.
+        """
+        self._proposal_timers.pop(cfp_id, None)
+        if self.pending_recharge_proposals.pop(cfp_id, None) is not None:
+            self.logger.warning("[CFP_RECHARGE] Proposta %s expirou sem resposta.", cfp_id)
+            if self.status == "await":
+                self.set_idle()
+
+    def new_cfp_id(self, kind):
+        """Gera um identificador de CFP único.
+        
+        Usa um contador partilhado em vez do relógio; o prefixo com o JID
+        do agente distingue os CFPs de diferentes Logistics Agents.
+        
+        Args:
+            kind (str): Tipo de CFP (e.g., "task", "inform_log").
+        
+        Returns:
+            str: Identificador no formato "cfp_<kind>_<agente>_<n>".
+        """
+        return f"cfp_{kind}_{self._cfp_prefix}_{next(_CFP_COUNTER)}"
 
     # =====================
     #   FUNÇÕES DE ENVIO DE MENSAGENS
@@ -939,12 +1160,12 @@ class LogisticsAgent(Agent):
         """
         await super().stop()
 
-    async def send_propose_recharge(self, to, cfp_id, eta_ticks, resources):
+    def send_propose_recharge(self, to, cfp_id, eta_ticks, resources):
         """Envia uma proposta de reabastecimento para outro agente.
         
         Cria e envia uma mensagem PROPOSE_RECHARGE com detalhes sobre
-        disponibilidade de recursos, ETA e prioridade. Armazena a proposta
-        na lista de propostas pendentes.
+        disponibilidade de recursos, ETA e prioridade. O registo da proposta
+        pendente fica a cargo de `track_proposal`.
         
         Args:
             to (str): JID do agente destinatário.
@@ -955,32 +1176,11 @@ class LogisticsAgent(Agent):
         Returns:
             Message: Objeto mensagem SPADE preparado para envio.
         """
-        msg = make_message(
-            to=to,
-            performative=PERFORMATIVE_PROPOSE_RECHARGE,
-            body_dict={
-                "cfp_id": cfp_id,
-                "eta_ticks": eta_ticks,
-                "resources": resources,
-                "priority": "High"
-            }
-        )
-        
-        
-        # Armazenar a proposta pendente
-        proposal_details = {
-            "position": self.pending_recharge_proposals.get(cfp_id, {}).get("position"), # Será preenchido no CFPRechargeReceiver
-            "task_type": self.pending_recharge_proposals.get(cfp_id, {}).get("task_type"),
-            "seed_type": self.pending_recharge_proposals.get(cfp_id, {}).get("seed_type"),
-            "resource_amount": resources,
-            "eta_ticks": eta_ticks,
-            "cfp_id": cfp_id
-        }
-        self.pending_recharge_proposals[cfp_id] = proposal_details
-        
+        body = _PROPOSE_RECHARGE_BODY % (dumps(cfp_id), dumps(eta_ticks), dumps(resources))
+        msg = Message(to=str(to), body=body, metadata=dict(_PROPOSE_RECHARGE_METADATA))
         return msg
 
-    async def send_accept_proposal(self, to, cfp_id):
+    def send_accept_proposal(self, to, cfp_id):
         """Envia uma mensagem de aceitação de proposta.
         
         Args:
@@ -990,18 +1190,10 @@ class LogisticsAgent(Agent):
         Returns:
             Message: Objeto mensagem SPADE de aceitação.
         """
-        msg = make_message(
-            to=to,
-            performative=PERFORMATIVE_ACCEPT_PROPOSAL,
-            body_dict={
-                "cfp_id": cfp_id,
-                "decision": "accept"
-            }
-        )
-        return msg
+        return Message(to=str(to), body=_ACCEPT_BODY % dumps(cfp_id), metadata=dict(_ACCEPT_METADATA))
 
 
-    async def send_reject_proposal(self, to, cfp_id):
+    def send_reject_proposal(self, to, cfp_id):
         """Envia uma mensagem de rejeição de proposta.
         
         Args:
@@ -1011,18 +1203,10 @@ class LogisticsAgent(Agent):
         Returns:
             Message: Objeto mensagem SPADE de rejeição.
         """
-        msg = make_message(
-            to=to,
-            performative=PERFORMATIVE_REJECT_PROPOSAL,
-            body_dict={
-                "cfp_id": cfp_id,
-                "decision": "reject"
-            }
-        )
-        return msg
+        return Message(to=str(to), body=_REJECT_BODY % dumps(cfp_id), metadata=dict(_REJECT_METADATA))
 
 
-    async def send_done(self, to, cfp_id, details):
+    def send_done(self, to, cfp_id, details):
         """Envia uma mensagem de confirmação de conclusão de tarefa.
         
         Args:
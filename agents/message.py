@@ -1,6 +1,57 @@
 from spade.message import Message
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Chaves não-string (e.g., dicionários indexados por tipo de semente) e tipos
+# numpy são serializados tal como pelo json da biblioteca standard
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+
+def dumps(body_dict):
+    """Serializa um corpo de mensagem para uma string JSON.
+    
+    Usa o `orjson` quando disponível (bastante mais rápido que o módulo `json`)
+    e recorre ao `json` da biblioteca standard caso contrário ou se o `orjson`
+    não souber serializar algum dos valores.
+    
+    Args:
+        body_dict (dict): Dicionário a serializar.
+    
+    Returns:
+        str: Representação JSON do dicionário.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(body_dict, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            pass
+    return json.dumps(body_dict)
+
+
+def loads(body):
+    """Descodifica o corpo JSON de uma mensagem.
+    
+    Usa o `orjson` quando disponível. Os erros de descodificação são sempre
+    `json.JSONDecodeError` (o `orjson.JSONDecodeError` é uma subclasse).
+    
+    Args:
+        body (str): Corpo da mensagem em JSON.
+    
+    Returns:
+        Objeto Python correspondente ao JSON (tipicamente um dict).
+    
+    Raises:
+        json.JSONDecodeError: Se o corpo não for JSON válido.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
 def make_message(to, performative, body_dict, protocol=None, language="json"):
     """Cria uma mensagem SPADE configurada com metadados e corpo JSON.
     
@@ -31,12 +82,40 @@ def make_message(to, performative, body_dict, protocol=None, language="json"):
         ...     protocol="negotiation"
         ... )
         >>> print(msg.body)
-        '{"status": "ready", "value": 42}'
+        '{"status":"ready","value":42}'
     """
     msg = Message(to=to)
     msg.set_metadata("performative", performative)
     msg.set_metadata("language", language)
     if protocol:
         msg.set_metadata("protocol", protocol)
-    msg.body = json.dumps(body_dict)
-    return msg
\ No newline at end of file
+    msg.body = dumps(body_dict)
+    return msg
+
+
+def make_messages(to_list, performative, body_dict, protocol=None, language="json"):
+    """Cria uma mensagem SPADE por destinatário partilhando o mesmo corpo JSON.
+    
+    Equivalente a chamar `make_message` para cada destinatário, mas o corpo
+    é serializado uma única vez. Útil para broadcasts (e.g., CFPs enviados a
+    todos os agentes logísticos).
+    
+    Args:
+        to_list (list): Lista de JIDs dos destinatários.
+        performative (str): Tipo de performativa das mensagens.
+        body_dict (dict): Dicionário com os dados a enviar. Será serializado
+            para JSON uma única vez.
+        protocol (str, optional): Nome do protocolo de comunicação utilizado.
+            Defaults to None.
+        language (str, optional): Linguagem de serialização do corpo da mensagem.
+            Defaults to "json".
+    
+    Returns:
+        list[spade.message.Message]: Uma mensagem por destinatário, pela mesma
+            ordem de `to_list`.
+    """
+    metadata = {"performative": performative, "language": language}
+    if protocol:
+        metadata["protocol"] = protocol
+    body = dumps(body_dict)
+    return [Message(to=str(to), body=body, metadata=dict(metadata)) for to in to_list]
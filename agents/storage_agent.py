@@ -6,7 +6,7 @@ import time
 from spade.agent import Agent
 from spade.behaviour import CyclicBehaviour
 from spade.template import Template
-from agents.message import make_message
+from agents.message import make_message, loads
 
 PERFORMATIVE_INFORM_RECEIVED = "inform_received"
 PERFORMATIVE_INFORM_HARVEST = "inform_harvest"
@@ -34,11 +34,11 @@ class InformHarvestReceiver(CyclicBehaviour):
         msg = await self.receive(timeout=5)
         if msg:
             try:
-                content = json.loads(msg.body)
+                content = loads(msg.body)
                 amount_type_list = content.get("amount_type", [])
                 sender_jid = str(msg.sender)
                 
-                self.agent.logger.info(f"[INFORM_HARVEST] Recebido colheita de {sender_jid}.")
+                self.agent.logger.info("[INFORM_HARVEST] Recebido colheita de %s.", sender_jid)
 
                 details_received = []
                 for item in amount_type_list:
@@ -49,19 +49,18 @@ class InformHarvestReceiver(CyclicBehaviour):
                         self.agent.yield_storage[seed_type] += amount
                         
                         details_received.append({"seed_type": seed_type, "amount": amount})
-                        self.agent.logger.info(f"[INFORM_HARVEST] Yield de semente {seed_type} atualizado. Adicionado: {amount}. Total: {self.agent.yield_storage[seed_type]}.")
+                        self.agent.logger.info("[INFORM_HARVEST] Yield de semente %s atualizado. Adicionado: %s. Total: %s.", seed_type, amount, self.agent.yield_storage[seed_type])
 
-                #print(self.agent.yield_storage)
                 # Enviar confirmação `inform_received`
                 if details_received:
                     msg = await self.agent.send_inform_received(sender_jid, details_received)
                     await self.send(msg)
-                    self.agent.logger.info(f"[INFORM_HARVEST] Confirmação 'inform_received' enviada para {sender_jid}.")
+                    self.agent.logger.info("[INFORM_HARVEST] Confirmação 'inform_received' enviada para %s.", sender_jid)
 
             except json.JSONDecodeError:
-                self.agent.logger.error(f"[INFORM_HARVEST] Erro ao descodificar JSON: {msg.body}")
+                self.agent.logger.error("[INFORM_HARVEST] Erro ao descodificar JSON: %s", msg.body)
             except Exception as e:
-                self.agent.logger.exception(f"[INFORM_HARVEST] Erro ao processar INFORM_HARVEST: {e}")
+                self.agent.logger.exception("[INFORM_HARVEST] Erro ao processar INFORM_HARVEST: %s", e)
 
 
 class StorageAgent(Agent):
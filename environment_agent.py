@@ -365,6 +365,11 @@ class EnvironmentManager(CyclicBehaviour):
             response_body = {"status": "error", "message": f"Erro ao executar ação {action}: {e}"}
             logger.error(f"Erro ao executar ação {action}: {e}")
 
+        # Ecoa o cfp_id do pedido (se existir) para o remetente associar a resposta à tarefa
+        cfp_id = content.get("cfp_id")
+        if cfp_id is not None:
+            response_body["cfp_id"] = cfp_id
+
         # Envia resposta
         reply = Message(to=msg.sender, body=json.dumps(response_body))
         reply.set_metadata("performative", PERFORMATIVE_INFORM)